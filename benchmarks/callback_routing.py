@@ -0,0 +1,70 @@
+"""
+Время маршрутизации callback'а: цепочка lambda-фильтров против CallbackRoutes.
+
+Хендлеры пустые, Bot API подменён — меряется только путь апдейта через
+диспетчер. Нажимается кнопка последнего зарегистрированного хендлера
+(худший случай для линейного перебора).
+
+    python -m benchmarks.callback_routing [--updates 500]
+"""
+import argparse
+import asyncio
+import time
+
+from aiogram import Bot, Dispatcher, Router
+
+from benchmarks.fake_bot import FakeBotSession, callback_update
+from handlers.routing import CallbackRoutes
+
+ROUTERS = 10  # как в main.py: хендлеры размазаны по ~10 роутерам
+
+
+async def noop(callback):
+    return None
+
+
+def linear_dispatcher(handlers: int) -> Dispatcher:
+    dp = Dispatcher()
+    routers = [Router() for _ in range(ROUTERS)]
+    for i in range(handlers):
+        name = f"action{i}"
+        routers[i * ROUTERS // handlers].callback_query.register(noop, lambda c, name=name: c.data == name)
+    for router in routers:
+        dp.include_router(router)
+    return dp
+
+
+def prefix_dispatcher(handlers: int) -> Dispatcher:
+    dp = Dispatcher()
+    routes = CallbackRoutes()
+    for i in range(handlers):
+        routes(f"action{i}")(noop)
+    dp.include_router(routes.router)
+    return dp
+
+
+async def measure(dp: Dispatcher, bot: Bot, data: str, updates: int) -> float:
+    batch = [callback_update(data, user_id=1) for _ in range(updates)]
+    for update in batch[:100]:  # прогрев
+        await dp.feed_update(bot, update)
+    started = time.perf_counter()
+    for update in batch:
+        await dp.feed_update(bot, update)
+    return (time.perf_counter() - started) / updates * 1e6
+
+
+async def main(updates: int):
+    bot = Bot(token="42:TEST", session=FakeBotSession())
+    print(f"{'хендлеров':>10} {'lambda, мкс':>12} {'префикс, мкс':>13}")
+    for handlers in (10, 30, 100, 300):
+        data = f"action{handlers - 1}"
+        linear = await measure(linear_dispatcher(handlers), bot, data, updates)
+        indexed = await measure(prefix_dispatcher(handlers), bot, data, updates)
+        print(f"{handlers:>10} {linear:>12.1f} {indexed:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.updates))
@@ -0,0 +1,133 @@
+"""Общие помощники для бенчмарков: временная база и синтетические данные."""
+import os
+import random
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from database.db import Base, make_engine
+from database.models import Event, Score, Team
+from database.totals import rebuild_team_totals
+from utils.constants import CATEGORIES
+
+
+@asynccontextmanager
+async def temp_database(profile: str = "default"):
+    """Пустая база во временном файле; отдаёт (engine, sessionmaker)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}", profile)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            yield engine, async_sessionmaker(bind=engine, expire_on_commit=False)
+        finally:
+            await engine.dispose()
+
+
+async def seed_event(session, teams: int, scores: int, seed: int = 1) -> int:
+    """Субботник с `teams` командами и `scores` случайными начислениями."""
+    rnd = random.Random(seed)
+    now = datetime.utcnow()
+
+    event_id = (
+        await session.execute(
+            insert(Event).values(title="Бенчмарк", created_by=0, created_at=now).returning(Event.id)
+        )
+    ).scalar_one()
+    team_ids = (
+        await session.execute(
+            insert(Team).returning(Team.id),
+            [{"name": f"Команда {i}", "event_id": event_id} for i in range(teams)],
+        )
+    ).scalars().all()
+
+    keys = list(CATEGORIES)
+    rows = []
+    for _ in range(scores):
+        key = rnd.choice(keys)
+        points = CATEGORIES[key][1]
+        if isinstance(points, list):
+            points = rnd.choice(points)
+        rows.append(
+            {"team_id": rnd.choice(team_ids), "category": key, "points": points, "created_at": now}
+        )
+    for i in range(0, len(rows), 10_000):
+        await session.execute(insert(Score), rows[i : i + 10_000])
+
+    await rebuild_team_totals(session)
+    await session.commit()
+    return event_id
+
+
+# Размеры для генератора: субботники, команды, начисления
+DATASET_SIZES = {
+    "small": (20, 2_000, 100_000),
+    "prod": (200, 20_000, 1_000_000),
+    "extreme": (1_000, 100_000, 10_000_000),
+}
+
+
+async def generate_dataset(session, events: int, teams: int, scores: int) -> None:
+    """
+    Заполняет events, teams и scores силами самой SQLite (рекурсивный CTE):
+    10M начислений вставляются за десятки секунд, без строк в Python.
+    Команды распределены по субботникам поровну, начисления — по командам
+    и категориям случайно (random() SQLite).
+    Итоги пересобираются, затем ANALYZE — как у базы, прожившей сезон.
+    """
+    keys = list(CATEGORIES)
+    category = " ".join(f"WHEN {i} THEN '{key}'" for i, key in enumerate(keys))
+    # фиксированные категории — мешки (1-3 шт.), остальные — баллы по выбору
+    points = " ".join(
+        f"WHEN {i} THEN 1 + i % {len(value)}" if isinstance(value, list) else f"WHEN {i} THEN {value} * (1 + i % 3)"
+        for i, (_, value, _) in enumerate(CATEGORIES.values())
+    )
+    count = " ".join(
+        f"WHEN {i} THEN 1 + i % 3"
+        for i, (_, value, _) in enumerate(CATEGORIES.values())
+        if not isinstance(value, list)
+    )
+
+    await session.execute(
+        text(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :events) "
+            "INSERT INTO events (id, title, created_at, created_by) "
+            "SELECT i, 'Субботник ' || i, datetime('2024-01-01', '+' || i || ' hours'), 0 FROM n"
+        ),
+        {"events": events},
+    )
+    await session.execute(
+        text(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :teams) "
+            "INSERT INTO teams (id, name, event_id) "
+            "SELECT i, 'Команда ' || i, (i - 1) % :events + 1 FROM n"
+        ),
+        {"teams": teams, "events": events},
+    )
+    await session.execute(
+        text(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :scores) "
+            "INSERT INTO scores (team_id, category, points, count, created_at) "
+            f"SELECT abs(random()) % :teams + 1, CASE k {category} END, CASE k {points} END, "
+            f"CASE k {count} ELSE 1 END, datetime('2024-01-01', '+' || (i % 1000000) || ' seconds') "
+            f"FROM (SELECT i, abs(random()) % {len(keys)} AS k FROM n)"
+        ),
+        {"scores": scores, "teams": teams},
+    )
+    await rebuild_team_totals(session)
+    await session.commit()
+    await session.execute(text("ANALYZE"))
+
+
+async def timeit(func, repeat: int = 5) -> float:
+    """Лучшее время из `repeat` запусков корутины, в миллисекундах."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
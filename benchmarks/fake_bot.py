@@ -0,0 +1,99 @@
+"""Фейковая сессия Bot API: ничего не шлёт в сеть, записывает вызовы и имитирует задержку."""
+import asyncio
+import itertools
+from datetime import datetime
+
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import GetMe, GetUpdates, SendDocument, SendMessage
+from aiogram.types import CallbackQuery, Chat, Document, Message, Update, User
+
+_update_ids = itertools.count(1)
+_message_ids = itertools.count(1_000_000)
+
+
+class FakeBotSession(BaseSession):
+    """
+    rtt — имитация сетевого round-trip до Bot API на каждый запрос, в секундах.
+    Для polling апдейты кладутся в `updates`, getUpdates отдаёт их пачкой.
+    """
+
+    def __init__(self, rtt: float = 0.0):
+        super().__init__()
+        self.rtt = rtt
+        self.calls: list = []
+        self.updates: asyncio.Queue[Update] = asyncio.Queue()
+
+    async def make_request(self, bot, method, timeout=None):
+        if isinstance(method, GetUpdates):
+            batch = [await self.updates.get()]
+            while not self.updates.empty():
+                batch.append(self.updates.get_nowait())
+            await asyncio.sleep(self.rtt / 2)  # ответ long-poll'а идёт к нам половину пути
+            return batch
+
+        self.calls.append(method)
+        if self.rtt:
+            await asyncio.sleep(self.rtt)
+
+        if isinstance(method, GetMe):
+            return User(id=42, is_bot=True, first_name="Bench", username="bench_bot")
+        if isinstance(method, (SendMessage, SendDocument)):
+            message = Message(
+                message_id=next(_message_ids),
+                date=datetime.now(),
+                chat=Chat(id=method.chat_id, type="private"),
+                text=getattr(method, "text", None),
+            )
+            if isinstance(method, SendDocument):
+                message = message.model_copy(
+                    update={"document": Document(file_id=f"FILE{message.message_id}", file_unique_id="u")}
+                )
+            return message
+        return True
+
+    def count(self, method_type) -> int:
+        return sum(isinstance(call, method_type) for call in self.calls)
+
+    async def close(self):
+        pass
+
+    async def stream_content(self, *args, **kwargs):
+        if False:
+            yield b""
+
+
+def _user(user_id: int) -> User:
+    return User(id=user_id, is_bot=False, first_name="Admin", username=f"admin{user_id}")
+
+
+def message_update(text: str, user_id: int) -> Update:
+    return Update(
+        update_id=next(_update_ids),
+        message=Message(
+            message_id=next(_message_ids),
+            date=datetime.now(),
+            chat=Chat(id=user_id, type="private"),
+            from_user=_user(user_id),
+            text=text,
+        ),
+    )
+
+
+def callback_update(data: str, user_id: int, message_id: int | None = None) -> Update:
+    message = Message(
+        message_id=message_id or next(_message_ids),
+        date=datetime.now(),
+        chat=Chat(id=user_id, type="private"),
+        from_user=_user(42),
+        text="…",
+    )
+    return Update(
+        update_id=next(_update_ids),
+        callback_query=CallbackQuery(
+            id=str(next(_update_ids)),
+            from_user=_user(user_id),
+            chat_instance="bench",
+            message=message,
+            data=data,
+        ),
+    )
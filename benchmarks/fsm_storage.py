@@ -0,0 +1,122 @@
+"""
+FSM-хранилище: MemoryStorage против SQLiteStorage на полном сценарии /score.
+
+    python -m benchmarks.fsm_storage [--admins 20] [--flows 50]
+
+Каждый «админ» проходит сценарий начисления баллов столько раз, сколько
+указано в --flows, с теми же вызовами FSM, что делают хендлеры и
+FSMContextMiddleware (get_state на каждый апдейт). Субботник, команда,
+категория и количество едут в callback_data (utils.callback_data), так что
+хендлеры /score пишут в FSM только на входе и на выходе из сценария.
+
+Перед замером check_flush_window проверяет, что чтения и update_data во время
+сброса видят несброшенное состояние, а не старую строку из базы.
+"""
+import argparse
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from sqlalchemy import func, select
+
+from benchmarks.common import temp_database
+from database.fsm_storage import SQLiteStorage
+from database.models import FSMRecord
+from states.score import ScoreStates
+
+
+async def score_flow(state: FSMContext):
+    # /score
+    await state.get_state()
+    await state.set_state(ScoreStates.waiting_for_event)
+    # ScoreEvent, ScoreTeam, ScoreCategory, ScoreConfirm — только get_state из middleware
+    for _ in range(4):
+        await state.get_state()
+    # score_stop
+    await state.get_state()
+    await state.clear()
+
+
+def gated(session_factory, committing: asyncio.Event, gate: asyncio.Event):
+    """Фабрика сессий, у которых commit ждёт gate — сброс «застревает» до коммита."""
+
+    @asynccontextmanager
+    async def factory():
+        async with session_factory() as session:
+            commit = session.commit
+
+            async def gated_commit():
+                committing.set()
+                await gate.wait()
+                await commit()
+
+            session.commit = gated_commit
+            yield session
+
+    return factory
+
+
+async def check_flush_window(session_factory) -> None:
+    committing, gate = asyncio.Event(), asyncio.Event()
+    storage = SQLiteStorage(gated(session_factory, committing, gate), flush_interval=60)
+    state = FSMContext(storage, StorageKey(bot_id=1, chat_id=-1, user_id=-1))
+    await state.set_state(ScoreStates.waiting_for_team)
+    await state.update_data(event_id=5)
+
+    flush = asyncio.create_task(storage.flush())
+    await committing.wait()
+    try:
+        # Сброс ждёт коммита: состояние должно читаться из памяти, а не из базы
+        assert await state.get_state() == ScoreStates.waiting_for_team.state
+        assert await state.get_data() == {"event_id": 5}
+        await state.update_data(page=2)
+    finally:
+        gate.set()
+        await flush
+    await storage.close()
+
+    fresh = FSMContext(SQLiteStorage(session_factory), state.key)
+    assert await fresh.get_state() == ScoreStates.waiting_for_team.state
+    assert await fresh.get_data() == {"event_id": 5, "page": 2}
+    await fresh.clear()
+    await fresh.storage.close()
+
+
+async def run(storage, admins: int, flows: int) -> float:
+    async def admin(user_id: int):
+        state = FSMContext(storage, StorageKey(bot_id=1, chat_id=user_id, user_id=user_id))
+        for _ in range(flows):
+            await score_flow(state)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(admin(user_id) for user_id in range(1, admins + 1)))
+    await storage.close()
+    return (time.perf_counter() - started) * 1000
+
+
+async def main(admins: int, flows: int):
+    memory_ms = await run(MemoryStorage(), admins, flows)
+
+    async with temp_database() as (engine, session_factory):
+        await check_flush_window(session_factory)
+        storage = SQLiteStorage(session_factory)
+        sqlite_ms = await run(storage, admins, flows)
+        async with session_factory() as session:
+            persisted = (await session.execute(select(func.count(FSMRecord.key)))).scalar_one()
+
+    total_flows = admins * flows
+    print(f"админов: {admins}, сценариев: {total_flows}")
+    print(f"MemoryStorage: {memory_ms:8.1f} ms  ({memory_ms / total_flows:.3f} ms/сценарий)")
+    print(f"SQLiteStorage: {sqlite_ms:8.1f} ms  ({sqlite_ms / total_flows:.3f} ms/сценарий)")
+    print(f"записей FSM: {storage.writes}, коммитов: {storage.flushes}, строк в fsm_states: {persisted}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--admins", type=int, default=20)
+    parser.add_argument("--flows", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.admins, args.flows))
@@ -0,0 +1,151 @@
+"""
+Нагрузочный тест: настоящий Dispatcher из main.py, фейковый Bot API,
+временная база SQLite.
+
+N админов одновременно проходят сценарий начисления /score → субботник →
+команда → категория → баллы → подтверждение (через раз — мешки на
+клавиатуре), между нажатиями — пауза --think, как у живого человека.
+Через раунд админ открывает отчёт, каждый десятый в конце выгружает Excel.
+Печатает p50/p95/p99 по видам апдейтов и пропускную способность; код
+выхода 1, если p95 выше --max-p95 или апдейтов в секунду меньше --min-rps.
+
+    python -m benchmarks.load_test [--admins 100] [--rounds 5] [--think 0.3]
+                                   [--rtt 0.0] [--max-p95 250] [--min-rps 0]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+
+def percentile(latencies: list[float], q: float) -> float:
+    return latencies[max(int(len(latencies) * q) - 1, 0)]
+
+
+def report(latencies: dict[str, list[float]]) -> float:
+    """Печатает перцентили по видам апдейтов; возвращает общий p95 в мс."""
+    latencies["всего"] = [x for kind in list(latencies) for x in latencies[kind]]
+    print(f"{'апдейт':>8} {'штук':>6} {'p50, мс':>8} {'p95, мс':>8} {'p99, мс':>8}")
+    for kind, values in latencies.items():
+        values.sort()
+        print(
+            f"{kind:>8} {len(values):>6} {percentile(values, 0.5) * 1000:>8.1f} "
+            f"{percentile(values, 0.95) * 1000:>8.1f} {percentile(values, 0.99) * 1000:>8.1f}"
+        )
+    return percentile(latencies["всего"], 0.95) * 1000
+
+
+async def main(admins: int, rounds: int, think: float, rtt: float, max_p95: float, min_rps: float) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        # config и database.db читают окружение при импорте — настраиваем его заранее
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["BOT_TOKEN"] = "42:TEST"
+        os.environ["ADMIN_IDS"] = ",".join(str(i) for i in range(1, admins + 1))
+        os.environ.setdefault("LOG_LEVEL", "WARNING")  # тысячи строк «Начислены баллы» в консоли
+
+        from aiogram import Bot
+        from sqlalchemy import select
+
+        from benchmarks.common import seed_event
+        from benchmarks.fake_bot import FakeBotSession, callback_update, message_update
+        from database.db import async_session, engine, init_db, read_engine
+        from database.models import Team
+        from database.score_writer import score_writer
+        from main import dp
+        from middlewares.throttling import ThrottlingMiddleware
+        from utils.admins import load_admins
+        from utils.callback_data import (
+            ExportEvent,
+            ReportEvent,
+            ScoreBags,
+            ScoreCategory,
+            ScoreConfirm,
+            ScoreEvent,
+            ScorePoints,
+            ScoreQty,
+            ScoreTeam,
+        )
+
+        logging.getLogger("aiogram.event").setLevel(logging.WARNING)
+        await init_db()
+        async with async_session() as session:
+            event_id = await seed_event(session, teams=200, scores=5_000)
+            team_ids = (await session.execute(select(Team.id).where(Team.event_id == event_id))).scalars().all()
+        await load_admins()
+
+        session = FakeBotSession(rtt)
+        bot = Bot(token="42:TEST", session=session)
+        throttling = next(m for m in dp.callback_query.outer_middleware if isinstance(m, ThrottlingMiddleware))
+        latencies: dict[str, list[float]] = defaultdict(list)
+        rnd = random.Random(1)
+
+        async def feed(kind: str, update) -> None:
+            started = time.perf_counter()
+            await dp.feed_update(bot, update)
+            latencies[kind].append(time.perf_counter() - started)
+            await asyncio.sleep(think * rnd.uniform(0.5, 1.5))
+
+        async def admin(user_id: int) -> None:
+            await asyncio.sleep(think * rnd.random())  # админы начинают вразнобой
+            for i in range(rounds):
+                team_id = rnd.choice(team_ids)
+                await feed("score", message_update("/score", user_id))
+                await feed("score", callback_update(ScoreEvent(event_id=event_id).pack(), user_id))
+                await feed("score", callback_update(ScoreTeam(team_id=team_id).pack(), user_id))
+                if i % 2:
+                    await feed("score", callback_update(ScoreCategory(team_id=team_id, key="big").pack(), user_id))
+                    await feed("score", callback_update(ScorePoints(team_id=team_id, key="big", points=5).pack(), user_id))
+                    await feed("confirm", callback_update(ScoreConfirm(team_id=team_id, key="big", points=5).pack(), user_id))
+                else:
+                    await feed("score", callback_update(ScoreCategory(team_id=team_id, key="metal").pack(), user_id))
+                    await feed("score", callback_update(ScoreQty(team_id=team_id, key="metal", count=3).pack(), user_id))
+                    await feed("confirm", callback_update(ScoreBags(team_id=team_id, key="metal", count=3).pack(), user_id))
+                if i % 2:
+                    await feed("report", callback_update(ReportEvent(event_id=event_id).pack(), user_id))
+            if user_id % 10 == 0:
+                await feed("export", callback_update(ExportEvent(event_id=event_id).pack(), user_id))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(admin(user_id) for user_id in range(1, admins + 1)))
+        elapsed = time.perf_counter() - started
+        await score_writer.stop()
+
+        updates = sum(len(values) for values in latencies.values())
+        p95 = report(latencies)
+        rps = updates / elapsed
+        print(
+            f"\n{updates} апдейтов за {elapsed:.1f} с: {rps:.0f} апдейтов/с; "
+            f"вызовов Bot API {len(session.calls)}, отсечено троттлингом {throttling.suppressed}"
+        )
+        print(f"очередь баллов: {score_writer.stats()}")
+
+        await engine.dispose()
+        await read_engine.dispose()
+
+    failed = []
+    if p95 > max_p95:
+        failed.append(f"p95 {p95:.1f} мс > {max_p95:g} мс")
+    if rps < min_rps:
+        failed.append(f"{rps:.0f} апдейтов/с < {min_rps:g}")
+    if failed:
+        print("❌ Регрессия: " + "; ".join(failed))
+        return 1
+    print("✅ В пределах порогов")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--admins", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5, help="начислений на админа")
+    parser.add_argument("--think", type=float, default=0.3, help="пауза между нажатиями, секунд")
+    parser.add_argument("--rtt", type=float, default=0.0, help="round-trip до Bot API, секунд")
+    parser.add_argument("--max-p95", type=float, default=250.0, help="порог p95, мс")
+    parser.add_argument("--min-rps", type=float, default=0.0, help="порог апдейтов в секунду")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.admins, args.rounds, args.think, args.rtt, args.max_p95, args.min_rps)))
@@ -0,0 +1,108 @@
+"""
+Задержка хендлера в зависимости от логирования.
+
+Хендлер пишет три строки в app_logger, как обычный хендлер начисления.
+off — логирование выключено, sync — FileHandler и StreamHandler прямо на
+корневом логгере (как было), queue — QueueHandler, запись в фоновом потоке
+(logger.setup_logging). Консоль направлена в /dev/null, файл — во временную папку.
+--sink-delay добавляет задержку на каждую запись в консоль — как у
+медленного терминала или переполненного pipe под docker logs.
+
+    python -m benchmarks.logging_overhead [--updates 5000] [--sink-delay 0.0002]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from aiogram import Bot, Dispatcher
+
+from benchmarks.fake_bot import FakeBotSession, callback_update
+from logger import app_logger, log_format, setup_logging
+
+
+async def handler(callback):
+    app_logger.info(f"🎯 Начислены баллы: 10 | Категория: 'metal' → Команда: 'T{callback.from_user.id}'")
+    app_logger.info(f"Команда {callback.from_user.id}: callback {callback.data}")
+    app_logger.info("Готово")
+
+
+class SlowStream:
+    def __init__(self, stream, delay: float):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        return self.stream.write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def make_handlers(log_dir: str, devnull) -> list[logging.Handler]:
+    handlers = [
+        logging.FileHandler(os.path.join(log_dir, "bench.log"), encoding="utf-8"),
+        logging.StreamHandler(devnull),
+    ]
+    for h in handlers:
+        h.setFormatter(logging.Formatter(log_format))
+    return handlers
+
+
+def attach(mode: str, log_dir: str, devnull):
+    """Перенастраивает корневой логгер; возвращает QueueListener для режима queue."""
+    root = logging.getLogger()
+    for h in root.handlers[:]:
+        root.removeHandler(h)
+    if mode == "off":
+        root.setLevel(logging.WARNING)
+    elif mode == "sync":
+        root.setLevel(logging.INFO)
+        for h in make_handlers(log_dir, devnull):
+            root.addHandler(h)
+    else:
+        return setup_logging(make_handlers(log_dir, devnull), logging.INFO)
+    return None
+
+
+async def measure(dp: Dispatcher, bot: Bot, updates: int) -> list[float]:
+    latencies = []
+    for i in range(updates):
+        update = callback_update("action", user_id=i)
+        started = time.perf_counter()
+        await dp.feed_update(bot, update)
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+async def main(updates: int, sink_delay: float):
+    dp = Dispatcher()
+    dp.callback_query.register(handler)
+    bot = Bot(token="42:TEST", session=FakeBotSession())
+    logging.getLogger("aiogram.event").setLevel(logging.WARNING)  # своя строка на каждый апдейт
+
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as null:
+        devnull = SlowStream(null, sink_delay)
+        print(f"{'режим':>6} {'p50, мкс':>9} {'p99, мкс':>9}")
+        for mode in ("off", "sync", "queue"):
+            listener = attach(mode, log_dir, devnull)
+            await measure(dp, bot, 200)  # прогрев
+            latencies = await measure(dp, bot, updates)
+            if listener is not None:
+                listener.stop()
+            p50 = latencies[len(latencies) // 2] * 1e6
+            p99 = latencies[int(len(latencies) * 0.99) - 1] * 1e6
+            print(f"{mode:>6} {p50:>9.1f} {p99:>9.1f}")
+        attach("off", log_dir, devnull)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--sink-delay", type=float, default=0.0, help="секунд на запись в консоль")
+    args = parser.parse_args()
+    asyncio.run(main(args.updates, args.sink_delay))
@@ -0,0 +1,68 @@
+"""
+Цена метрик на апдейт и на SQL-запрос.
+
+Хендлер делает один SELECT в SQLite в памяти. off — метрики выключены
+(как по умолчанию), on — MetricsMiddleware на callback_query и наблюдатель
+запросов metrics.observe_query на движке.
+
+    python -m benchmarks.metrics_overhead [--updates 5000]
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from aiogram import Bot, Dispatcher
+from sqlalchemy import text
+
+import metrics
+from benchmarks.fake_bot import FakeBotSession, callback_update
+from database.db import make_engine, query_observers
+from middlewares.metrics import MetricsMiddleware
+
+
+async def measure(dp: Dispatcher, bot: Bot, updates: int) -> list[float]:
+    latencies = []
+    for i in range(updates):
+        update = callback_update(f"score_team:{i % 50}", user_id=i)
+        started = time.perf_counter()
+        await dp.feed_update(bot, update)
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+async def main(updates: int):
+    engine = make_engine("sqlite+aiosqlite:///:memory:")
+
+    async def handler(callback):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1 WHERE 2 IN (1, 2, 3)"))
+
+    bot = Bot(token="42:TEST", session=FakeBotSession())
+    logging.getLogger("aiogram.event").setLevel(logging.WARNING)
+    query_observers.clear()  # только наблюдатели этого бенчмарка
+
+    print(f"{'режим':>6} {'p50, мкс':>9} {'p99, мкс':>9}")
+    for mode in ("off", "on"):
+        dp = Dispatcher()
+        dp.callback_query.register(handler)
+        if mode == "on":
+            dp.callback_query.middleware(MetricsMiddleware())
+            metrics.enable_sql_metrics()
+        await measure(dp, bot, 200)  # прогрев
+        latencies = await measure(dp, bot, updates)
+        p50 = latencies[len(latencies) // 2] * 1e6
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1e6
+        print(f"{mode:>6} {p50:>9.1f} {p99:>9.1f}")
+
+    query_observers.clear()
+    await engine.dispose()
+    print(f"\nсерий: {sum(m.series_count() for m in metrics.REGISTRY)}, "
+          f"/metrics: {len(metrics.render())} байт")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.updates))
@@ -0,0 +1,192 @@
+"""
+Планы и время горячих запросов хендлеров на большой базе.
+
+    python -m benchmarks.query_plans [--size small|prod|extreme] [--repeat 5] [--update-baseline]
+
+Схема создаётся так же, как при старте бота (create_all + миграции), база
+заполняется benchmarks.common.generate_dataset (extreme — 1k субботников,
+100k команд, 10M начислений; генерация — около полутора минут).
+Каждый запрос из hot_queries выполняется тем же кодом, что и в хендлере
+(те же функции и построители запросов); SQL, который он отправил в базу,
+перехватывается, и для него снимается EXPLAIN QUERY PLAN. Код выхода 1, если:
+- в планах нет индекса, по которому запрос обязан идти;
+- по сравнению с query_plans_baseline.json появился полный скан таблицы
+  или план изменился как-то ещё.
+После намеренного изменения запросов базовые планы обновляются флагом
+--update-baseline (их стоит снимать на --size prod).
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+
+from sqlalchemy import event
+
+from benchmarks.common import DATASET_SIZES, generate_dataset, temp_database, timeit
+from database.migrations import run_migrations
+from database.models import Event
+from database.pagination import get_event_teams_page
+from database.totals import (
+    event_ranking_stmt,
+    get_event_bag_totals,
+    get_event_ranking,
+    team_balances_stmt,
+    team_category_balance_stmt,
+)
+from handlers.event_picker import EVENTS_PER_PAGE
+from handlers.score import ITEMS_PER_PAGE
+from handlers.score_manage import adjust_teams_stmt
+from handlers.view import teams as view_teams
+from handlers.view.events import events_list_stmt
+from handlers.view.report import event_picker
+from utils.cache import teams_view_cache
+from utils.entities import get_team, invalidate_team
+
+BASELINE = os.path.join(os.path.dirname(__file__), "query_plans_baseline.json")
+FULL_SCAN = re.compile(r"^SCAN \w+$")  # SCAN без USING INDEX — чтение всей таблицы
+TOTALS_PK = "sqlite_autoindex_team_category_totals_1"
+
+
+def hot_queries(events: int, teams: int) -> dict:
+    """имя -> (корутина(session), индекс, который обязан быть в плане): запросы так, как их делают хендлеры."""
+    event_id = events // 2
+    team_id = event_id  # команды раскладываются по субботникам по кругу: team i -> event i
+    last_page = (teams + view_teams.ITEMS_PER_PAGE - 1) // view_teams.ITEMS_PER_PAGE
+
+    async def all_teams_page(session, page: int):
+        teams_view_cache.clear()  # иначе со второго раза страница берётся из кэша
+        return await view_teams.render_teams_page(session, page)
+
+    async def team_scores(session):
+        # handlers.score_manage.render_team_scores
+        invalidate_team(team_id)
+        await get_team(team_id, session)
+        return await execute(session, team_balances_stmt(team_id))
+
+    async def export(session):
+        # handlers.view.export_excel.handle_export_event без сборки xlsx
+        session.expunge_all()
+        await session.get(Event, event_id)
+        rows = await execute(session, event_ranking_stmt(event_id))
+        return rows, await get_event_bag_totals(session, event_id)
+
+    async def execute(session, stmt):
+        return (await session.execute(stmt)).all()
+
+    return {
+        "events picker": (lambda s: event_picker.keyboard(s), "ix_events_created_at"),
+        "events picker next": (
+            lambda s: event_picker.keyboard(s, page=2, after_id=events - EVENTS_PER_PAGE + 1),
+            "ix_events_created_at",
+        ),
+        "events list": (lambda s: execute(s, events_list_stmt()), "ix_events_created_at"),
+        "event teams page": (
+            lambda s: get_event_teams_page(s, event_id, per_page=ITEMS_PER_PAGE),
+            "ix_teams_event_id",
+        ),
+        "event teams next": (
+            lambda s: get_event_teams_page(s, event_id, page=2, per_page=ITEMS_PER_PAGE, after_id=team_id),
+            "ix_teams_event_id",
+        ),
+        "all teams page": (lambda s: all_teams_page(s, 1), "ix_teams_event_id"),
+        "all teams last page": (lambda s: all_teams_page(s, last_page), "ix_teams_event_id"),
+        "adjust teams": (lambda s: execute(s, adjust_teams_stmt(event_id)), "ix_teams_event_id"),
+        "team scores": (team_scores, TOTALS_PK),
+        # Вычитание (SubtractScore): одна строка баланса по PK
+        "team category balance": (
+            lambda s: execute(s, team_category_balance_stmt(team_id, "metal")),
+            TOTALS_PK,
+        ),
+        "report": (lambda s: get_event_ranking(s, event_id), "ix_teams_event_id"),
+        "export": (export, "ix_teams_event_id"),
+    }
+
+
+async def explain(conn, statements: list[tuple[str, tuple]]) -> list[list[str]]:
+    plans = []
+    for statement, parameters in statements:
+        rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        plans.append([row[-1] for row in rows])
+    return plans
+
+
+def check_index(plans: list[list[str]], index: str) -> str | None:
+    """Описание проблемы или None, если запрос идёт по своему индексу."""
+    if not any(index in line for plan in plans for line in plan):
+        return f"нет индекса {index}"
+    return None
+
+
+def check_baseline(plans: list[list[str]], baseline: list[list[str]] | None) -> str | None:
+    """Описание проблемы или None, если план совпал с базовым."""
+    if baseline is None:
+        return "нет базового плана (--update-baseline)"
+    known = {line for plan in baseline for line in plan}
+    scans = [line for plan in plans for line in plan if FULL_SCAN.match(line) and line not in known]
+    if scans:
+        return "ПОЛНЫЙ СКАН: " + ", ".join(scans)
+    if plans != baseline:
+        return "план изменился"
+    return None
+
+
+async def main(size: str, repeat: int, update_baseline: bool) -> int:
+    events, teams, scores = DATASET_SIZES[size]
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    async with temp_database() as (engine, session_factory):
+        async with engine.connect() as conn:
+            await conn.run_sync(run_migrations)
+        async with session_factory() as session:
+            await generate_dataset(session, events, teams, scores)
+        print(f"{size}: {events} субботников, {teams} команд, {scores} начислений\n")
+
+        captured: list[tuple[str, tuple]] = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if (statement, parameters) not in captured:
+                captured.append((statement, parameters))
+
+        failed = 0
+        plans_by_name = {}
+        async with session_factory() as session:
+            for name, (query, index) in hot_queries(events, teams).items():
+                event.listen(engine.sync_engine, "before_cursor_execute", capture)
+                await query(session)
+                event.remove(engine.sync_engine, "before_cursor_execute", capture)
+                async with engine.connect() as conn:
+                    plans = await explain(conn, captured)
+                captured.clear()
+
+                elapsed = await timeit(lambda: query(session), repeat)
+                problem = check_index(plans, index)
+                if problem is None and not update_baseline:
+                    problem = check_baseline(plans, baseline.get(name))
+                failed += problem is not None
+                plans_by_name[name] = plans
+                print(f"{'❌' if problem else '✅'} {name:<22} {elapsed:9.2f} мс  {problem or ''}")
+                if problem:
+                    for plan in plans:
+                        print("      " + "\n      ".join(plan))
+                await session.rollback()  # не держим снимок между запросами
+
+    if update_baseline and not failed:
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(plans_by_name, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"\nБазовые планы записаны в {BASELINE}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=DATASET_SIZES, default="prod")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.size, args.repeat, args.update_baseline)))
@@ -0,0 +1,70 @@
+"""
+Сравнение старого и нового построения отчёта по субботнику.
+
+    python -m benchmarks.report_query [--teams 500] [--scores 50000]
+
+old — selectinload(Team.scores) + суммирование и сортировка в Python,
+new — один GROUP BY с RANK()/ROW_NUMBER() (database.totals.get_event_ranking).
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from benchmarks.common import seed_event, temp_database, timeit
+from database.models import Team
+from database.totals import get_event_ranking
+
+
+async def old_report(session, event_id: int) -> list[tuple[int, int]]:
+    stmt = select(Team).where(Team.event_id == event_id).options(selectinload(Team.scores))
+    teams = (await session.execute(stmt)).scalars().all()
+
+    teams_with_totals = [(team, sum(score.points for score in team.scores)) for team in teams]
+    teams_with_totals.sort(key=lambda x: x[1], reverse=True)
+
+    sorted_teams = []
+    i = 0
+    while i < len(teams_with_totals):
+        same_points = [teams_with_totals[i]]
+        j = i + 1
+        while j < len(teams_with_totals) and teams_with_totals[j][1] == teams_with_totals[i][1]:
+            same_points.append(teams_with_totals[j])
+            j += 1
+        same_points.sort(key=lambda x: x[0].id)
+        sorted_teams.extend(same_points)
+        i = j
+    return [(team.id, total) for team, total in sorted_teams]
+
+
+async def new_report(session, event_id: int) -> list[tuple[int, int]]:
+    return [(team.team_id, team.total) for team in await get_event_ranking(session, event_id)]
+
+
+async def main(teams: int, scores: int, repeat: int):
+    async with temp_database() as (engine, session_factory):
+        async with session_factory() as session:
+            event_id = await seed_event(session, teams, scores)
+
+        async def run(report):
+            async with session_factory() as session:
+                return await report(session, event_id)
+
+        assert await run(old_report) == await run(new_report), "порядок команд расходится"
+
+        old_ms = await timeit(lambda: run(old_report), repeat)
+        new_ms = await timeit(lambda: run(new_report), repeat)
+
+    print(f"команд: {teams}, начислений: {scores}")
+    print(f"old (ORM + Python): {old_ms:8.1f} ms")
+    print(f"new (SQL GROUP BY): {new_ms:8.1f} ms  (x{old_ms / new_ms:.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, default=500)
+    parser.add_argument("--scores", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.teams, args.scores, args.repeat))
@@ -0,0 +1,60 @@
+"""
+Начисления баллов: коммит на каждое нажатие против очереди ScoreWriter.
+
+    python -m benchmarks.score_writer [--admins 10] [--taps 100] [--profile wal]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks.common import seed_event, temp_database
+from database.db import SQLITE_PROFILES
+from database.models import Score, Team
+from database.score_writer import ScoreWriter
+from database.totals import apply_score_delta
+
+
+async def main(admins: int, taps: int, profile: str):
+    async with temp_database(profile) as (engine, session_factory):
+        async with session_factory() as session:
+            await seed_event(session, teams=200, scores=0)
+            team_ids = list((await session.execute(Team.__table__.select())).scalars())
+
+        async def per_tap(seed: int):
+            rnd = random.Random(seed)
+            for _ in range(taps):
+                team_id = rnd.choice(team_ids)
+                async with session_factory() as session:
+                    session.add(Score(team_id=team_id, category="metal", points=10))
+                    await apply_score_delta(session, team_id, "metal", 10, entries=1)
+                    await session.commit()
+
+        writer = ScoreWriter(session_factory)
+
+        async def queued(seed: int):
+            rnd = random.Random(seed)
+            for _ in range(taps):
+                await writer.add_score(rnd.choice(team_ids), "metal", 10)
+
+        for name, admin in (("коммит на нажатие", per_tap), ("ScoreWriter", queued)):
+            started = time.perf_counter()
+            await asyncio.gather(*(admin(i) for i in range(admins)))
+            elapsed = time.perf_counter() - started
+            print(f"{name:>18}: {admins * taps / elapsed:8.0f} начислений/с")
+
+        await writer.stop()
+        stats = writer.stats()
+        print(
+            f"ScoreWriter: коммитов {stats['commits']}, в среднем {stats['avg_batch']:.1f} "
+            f"начислений на коммит, макс. глубина очереди {stats['max_queue_depth']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--admins", type=int, default=10)
+    parser.add_argument("--taps", type=int, default=100)
+    parser.add_argument("--profile", choices=list(SQLITE_PROFILES), default="wal")
+    args = parser.parse_args()
+    asyncio.run(main(args.admins, args.taps, args.profile))
@@ -0,0 +1,99 @@
+"""
+Задержка записи баллов, пока параллельно строятся отчёты.
+
+    python -m benchmarks.sqlite_concurrency [--writers 5] [--readers 3]
+
+Для каждого профиля из database.db.SQLITE_PROFILES: writers «админов»
+начисляют баллы (по коммиту на начисление, как confirm_score), а readers
+в это время без остановки строят отчёт и выгрузку через отдельный
+read-only движок. Печатаются перцентили задержки коммита и число ошибок
+"database is locked".
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.common import seed_event, temp_database
+from database.db import SQLITE_PROFILES, make_engine
+from database.models import Score, Team
+from database.totals import apply_score_delta, get_event_bag_totals, get_event_ranking
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def bench_profile(profile: str, writers: int, readers: int, writes: int) -> None:
+    async with temp_database(profile) as (engine, session_factory):
+        async with session_factory() as session:
+            event_id = await seed_event(session, teams=500, scores=50_000)
+            team_ids = list((await session.execute(Team.__table__.select())).scalars())
+
+        read_engine = make_engine(str(engine.url), profile, read_only=True)
+        read_session = async_sessionmaker(bind=read_engine, expire_on_commit=False)
+
+        latencies: list[float] = []
+        errors = 0
+        reports = 0
+        done = asyncio.Event()
+
+        async def writer(seed: int):
+            nonlocal errors
+            rnd = random.Random(seed)
+            for _ in range(writes):
+                team_id = rnd.choice(team_ids)
+                started = time.perf_counter()
+                try:
+                    async with session_factory() as session:
+                        session.add(Score(team_id=team_id, category="metal", points=10))
+                        await apply_score_delta(session, team_id, "metal", 10, entries=1)
+                        await session.commit()
+                except OperationalError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        async def reader():
+            nonlocal errors, reports
+            while not done.is_set():
+                try:
+                    async with read_session() as session:
+                        await get_event_ranking(session, event_id)
+                        await get_event_bag_totals(session, event_id)
+                    reports += 1
+                except OperationalError:
+                    errors += 1
+                await asyncio.sleep(0)
+
+        reader_tasks = [asyncio.create_task(reader()) for _ in range(readers)]
+        await asyncio.gather(*(writer(i) for i in range(writers)))
+        done.set()
+        await asyncio.gather(*reader_tasks)
+        await read_engine.dispose()
+
+    print(
+        f"{profile:>8}: коммит p50 {percentile(latencies, 50):6.1f} ms, "
+        f"p95 {percentile(latencies, 95):6.1f} ms, max {max(latencies):7.1f} ms, "
+        f"среднее {statistics.mean(latencies):6.1f} ms | отчётов: {reports} | ошибок: {errors}"
+    )
+
+
+async def main(writers: int, readers: int, writes: int):
+    print(f"писателей: {writers} × {writes} начислений, читателей: {readers}")
+    for profile in SQLITE_PROFILES:
+        await bench_profile(profile, writers, readers, writes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=5)
+    parser.add_argument("--readers", type=int, default=3)
+    parser.add_argument("--writes", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.writers, args.readers, args.writes))
@@ -0,0 +1,73 @@
+"""
+Сессия на каждый запрос против одной сессии на апдейт (UnitOfWork).
+
+Апдейт — три коротких чтения, как у типичного нажатия в сценарии начисления:
+страница субботников, команда по PK, страница команд.
+
+    python -m benchmarks.uow_sessions [--updates 2000] [--profile wal]
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+
+from benchmarks.common import seed_event, temp_database
+from database.models import Team
+from database.pagination import get_event_teams_page, get_events_page
+from middlewares.db_session import UnitOfWork
+
+
+async def reads(session, event_id: int, team_id: int) -> None:
+    await get_events_page(session, per_page=8)
+    (await session.execute(select(Team.id, Team.name, Team.event_id).where(Team.id == team_id))).first()
+    await get_event_teams_page(session, event_id, per_page=10)
+
+
+async def session_per_query(factory, event_id: int, team_id: int) -> None:
+    # Как было в хендлерах: отдельный `async with async_session()` на каждое обращение
+    async with factory() as session:
+        await get_events_page(session, per_page=8)
+    async with factory() as session:
+        (await session.execute(select(Team.id, Team.name, Team.event_id).where(Team.id == team_id))).first()
+    async with factory() as session:
+        await get_event_teams_page(session, event_id, per_page=10)
+
+
+async def unit_of_work(factory, event_id: int, team_id: int) -> None:
+    uow = UnitOfWork(factory, factory)
+    try:
+        await reads(uow.read, event_id, team_id)
+        await uow.commit()
+    finally:
+        await uow.close()
+
+
+async def measure(func, factory, event_id: int, team_id: int, updates: int) -> float:
+    for _ in range(100):  # прогрев пула и кэша операторов
+        await func(factory, event_id, team_id)
+    started = time.perf_counter()
+    for _ in range(updates):
+        await func(factory, event_id, team_id)
+    return (time.perf_counter() - started) / updates * 1e6
+
+
+async def main(updates: int, profile: str):
+    async with temp_database(profile) as (engine, factory):
+        async with factory() as session:
+            event_id = await seed_event(session, teams=200, scores=2_000)
+            team_id = (await session.execute(select(Team.id).limit(1))).scalar_one()
+
+        old = await measure(session_per_query, factory, event_id, team_id, updates)
+        new = await measure(unit_of_work, factory, event_id, team_id, updates)
+
+    print(f"сессия на запрос: {old:8.1f} мкс на апдейт")
+    print(f"сессия на апдейт: {new:8.1f} мкс на апдейт ({(1 - new / old) * 100:.0f}% быстрее)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--profile", default="wal")
+    args = parser.parse_args()
+    asyncio.run(main(args.updates, args.profile))
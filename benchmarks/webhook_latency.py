@@ -0,0 +1,111 @@
+"""
+Задержка ответа на апдейт: long polling против вебхука на aiohttp.
+
+Бот API подменён фейковой сессией с искусственным round-trip (--rtt),
+апдейты для вебхука отправляются POST'ом как JSON — так же, как их шлёт
+Telegram. В вебхуке ответ на callback уходит в теле HTTP-ответа, поэтому
+на каждое нажатие на один запрос к Bot API меньше.
+
+    python -m benchmarks.webhook_latency [--updates 100] [--rtt 0.03]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+def report(name: str, latencies: list[float], api_calls: int) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:>8}: p50 {statistics.median(latencies) * 1000:7.1f} мс, "
+        f"p95 {p95 * 1000:7.1f} мс, запросов к Bot API на апдейт {api_calls / len(latencies):.2f}"
+    )
+
+
+async def main(updates: int, rtt: float):
+    with tempfile.TemporaryDirectory() as tmp:
+        # config и database.db читают окружение при импорте — настраиваем его заранее
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["BOT_TOKEN"] = "42:TEST"
+        os.environ["ADMIN_IDS"] = ",".join(str(i) for i in range(1, 2 * updates + 1))
+
+        from aiogram import BaseMiddleware, Bot
+        from aiohttp import ClientSession
+        from aiohttp.test_utils import TestServer
+
+        from benchmarks.common import seed_event
+        from benchmarks.fake_bot import FakeBotSession, callback_update
+        from database.db import async_session, engine, init_db, read_engine
+        from main import dp
+        from utils.admins import load_admins
+        from webhook import build_app
+
+        await init_db()
+        async with async_session() as session:
+            event_id = await seed_event(session, teams=200, scores=5_000)
+        await load_admins()
+
+        # Разные пользователи на каждый апдейт — чтобы не упираться в троттлинг
+        def make_update(i: int):
+            data = "view_teams" if i % 2 else f"report_event:{event_id}"
+            return callback_update(data, user_id=i)
+
+        # --- вебхук ---
+        session = FakeBotSession(rtt)
+        bot = Bot(token="42:TEST", session=session)
+        latencies = []
+        async with TestServer(build_app(dp, bot, path="/webhook", secret=None)) as server:
+            async with ClientSession() as client:
+                url = server.make_url("/webhook")
+                for i in range(1, updates + 1):
+                    payload = make_update(i).model_dump(mode="json", exclude_none=True)
+                    started = time.perf_counter()
+                    await asyncio.sleep(rtt / 2)  # доставка апдейта от Telegram до нас
+                    async with client.post(url, json=payload) as response:
+                        assert response.status == 200, await response.text()
+                        await response.read()
+                    await asyncio.sleep(rtt / 2)  # ответ вебхука идёт обратно в Telegram
+                    latencies.append(time.perf_counter() - started)
+        report("вебхук", latencies, len(session.calls))
+
+        # --- long polling ---
+        session = FakeBotSession(rtt)
+        bot = Bot(token="42:TEST", session=session)
+        done: dict[int, asyncio.Future] = {}
+
+        class Done(BaseMiddleware):
+            async def __call__(self, handler, event, data):
+                try:
+                    return await handler(event, data)
+                finally:
+                    done[event.update_id].set_result(time.perf_counter())
+
+        dp.update.outer_middleware(Done())
+        polling = asyncio.create_task(dp.start_polling(bot, handle_signals=False, close_bot_session=False))
+        await asyncio.sleep(0.1)
+        session.calls.clear()  # getMe при старте не считаем
+
+        latencies = []
+        for i in range(updates + 1, 2 * updates + 1):
+            update = make_update(i)
+            done[update.update_id] = asyncio.get_running_loop().create_future()
+            started = time.perf_counter()
+            session.updates.put_nowait(update)
+            latencies.append(await done[update.update_id] - started)
+        report("polling", latencies, len(session.calls))
+
+        await dp.stop_polling()
+        await polling
+        await engine.dispose()
+        await read_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=100)
+    parser.add_argument("--rtt", type=float, default=0.03, help="round-trip до Bot API, секунд")
+    args = parser.parse_args()
+    asyncio.run(main(args.updates, args.rtt))
@@ -0,0 +1,165 @@
+"""
+Компакция журнала баллов.
+
+scores — журнал только на добавление: каждое начисление и вычитание —
+новая строка, а баланс (команда, категория) сразу сворачивается в
+team_category_totals через UPSERT (database.totals.apply_score_delta).
+Поэтому старые строки журнала для чтения больше не нужны: фоновая задача
+переносит их пачками в scores_archive, и живая таблица остаётся маленькой.
+
+Пачка переносится одной транзакцией через очередь score_writer — так
+компакция не спорит за блокировку записи с начислениями. Ручной запуск
+(перенести всё и сверить балансы с журналом):
+
+    python -m database.compaction
+"""
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import Score, ScoreArchive, TeamCategoryTotal
+from database.score_writer import ScoreWriter, score_writer
+from database.totals import ledger_rows
+from logger import db_logger
+
+COMPACTION_INTERVAL = 600  # секунд между проходами
+COMPACTION_MIN_AGE = 3600  # секунд: свежие строки журнала не трогаем
+COMPACTION_BATCH = 1000  # строк журнала на одну транзакцию
+
+
+@dataclass
+class ArchiveScores:
+    """Мутация для очереди score_writer: переносит пачку старых строк в архив."""
+
+    before: datetime
+    limit: int
+
+    async def apply(self, session: AsyncSession) -> int:
+        ids = (
+            await session.execute(
+                select(Score.id).where(Score.created_at < self.before).order_by(Score.id).limit(self.limit)
+            )
+        ).scalars().all()
+        if not ids:
+            return 0
+
+        await session.execute(
+            insert(ScoreArchive).from_select(
+                ["score_id", "team_id", "category", "points", "count", "created_at", "archived_at"],
+                select(
+                    Score.id,
+                    Score.team_id,
+                    Score.category,
+                    Score.points,
+                    Score.count,
+                    Score.created_at,
+                    literal(datetime.utcnow()),
+                ).where(Score.id.in_(ids)),
+            )
+        )
+        await session.execute(delete(Score).where(Score.id.in_(ids)))
+        return len(ids)
+
+
+class ScoreCompactor:
+    def __init__(
+        self,
+        writer: ScoreWriter = score_writer,
+        interval: float = COMPACTION_INTERVAL,
+        min_age: float = COMPACTION_MIN_AGE,
+        batch: int = COMPACTION_BATCH,
+    ):
+        self.writer = writer
+        self.interval = interval
+        self.min_age = min_age
+        self.batch = batch
+        self.archived = 0
+        self._task: asyncio.Task | None = None
+
+    async def compact(self, min_age: float | None = None) -> int:
+        """Один проход: переносит в архив все строки старше min_age; сколько перенесено."""
+        before = datetime.utcnow() - timedelta(seconds=self.min_age if min_age is None else min_age)
+        moved = 0
+        while True:
+            count = await self.writer.submit(ArchiveScores(before, self.batch))
+            moved += count
+            if count < self.batch:
+                break
+        if moved:
+            self.archived += moved
+            db_logger.info(f"🗜️ Компакция журнала баллов: в архив перенесено {moved} строк")
+        return moved
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.compact()
+            except Exception:
+                db_logger.exception("❌ Компакция журнала баллов не удалась")
+
+
+async def find_drift(session: AsyncSession) -> list[tuple]:
+    """
+    Балансы, не совпадающие с суммой журнала и архива:
+    (team_id, category, баллы в балансе, баллы по журналу).
+    """
+    ledger = ledger_rows()
+    sums = (
+        select(ledger.c.team_id, ledger.c.category, func.sum(ledger.c.points).label("points"))
+        .group_by(ledger.c.team_id, ledger.c.category)
+        .having(func.sum(ledger.c.count) > 0)
+        .subquery()
+    )
+    tct = TeamCategoryTotal
+    # FULL OUTER JOIN в SQLite появился только в 3.39 — собираем из двух LEFT JOIN
+    missing_or_wrong = select(sums.c.team_id, sums.c.category, tct.points, sums.c.points).outerjoin(
+        tct, (tct.team_id == sums.c.team_id) & (tct.category == sums.c.category)
+    ).where(tct.points.is_(None) | (tct.points != sums.c.points))
+    extra = select(tct.team_id, tct.category, tct.points, sums.c.points).outerjoin(
+        sums, (tct.team_id == sums.c.team_id) & (tct.category == sums.c.category)
+    ).where(sums.c.points.is_(None))
+
+    rows = (await session.execute(missing_or_wrong)).all() + (await session.execute(extra)).all()
+    return [tuple(row) for row in rows]
+
+
+score_compactor = ScoreCompactor()
+
+
+async def _main():
+    from database.db import async_session, engine, init_db, read_engine
+
+    await init_db()
+    await score_compactor.compact(min_age=0)
+    await score_writer.stop()
+
+    async with async_session() as session:
+        drift = await find_drift(session)
+    for team_id, category, balance, ledger in drift:
+        db_logger.warning(f"⚠️ Баланс расходится с журналом: команда {team_id}, '{category}': {balance} ≠ {ledger}")
+    if not drift:
+        db_logger.info("✅ Балансы совпадают с журналом")
+
+    await engine.dispose()
+    await read_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -1,16 +1,112 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+import time
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 
+from config import DATABASE_URL, SQLITE_PROFILE
 from logger import db_logger
 
-DATABASE_URL = "sqlite+aiosqlite:///database/bot.db"
+# Профили PRAGMA, применяемые к каждому новому соединению SQLite
+SQLITE_PROFILES: dict[str, dict[str, str | int]] = {
+    # Как было раньше: настройки SQLite по умолчанию
+    "default": {},
+    # WAL: чтения не блокируют запись и наоборот
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",  # в WAL безопасно, fsync только на checkpoint
+        "cache_size": -16000,  # 16 МБ (отрицательное значение — в КиБ)
+        "mmap_size": 268435456,  # 256 МБ
+        "busy_timeout": 5000,  # мс ожидания блокировки вместо "database is locked"
+        "temp_store": "MEMORY",
+    },
+}
+
+
+# Наблюдатели за запросами: callback(statement, секунд). Пока список пуст,
+# хуки курсора сводятся к одной проверке — таймер не ставится. В работающем
+# боте список не пуст никогда: DbSessionMiddleware всегда ставит счётчик
+# запросов апдейта (для предупреждения о медленных апдейтах), так что каждый
+# запрос засекается — perf_counter и append/pop в conn.info. Метрики
+# (METRICS_ENABLED) добавляют к этому только свой наблюдатель.
+QueryObserver = Callable[[str, float], None]
+query_observers: list[QueryObserver] = []
+
+
+def add_query_observer(observer: QueryObserver) -> None:
+    if observer not in query_observers:
+        query_observers.append(observer)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if query_observers:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if started:  # наблюдатель мог появиться между before и after
+        elapsed = time.perf_counter() - started.pop()
+        for observer in query_observers:
+            observer(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    # Запрос упал — after_cursor_execute не будет, снимаем его отметку
+    conn = exception_context.connection
+    started = conn.info.get("query_started") if conn is not None else None
+    if started:
+        started.pop()
+
+
+def make_engine(
+    url: str = DATABASE_URL, profile: str = SQLITE_PROFILE, read_only: bool = False
+) -> AsyncEngine:
+    """Создаёт движок и навешивает PRAGMA выбранного профиля на каждое соединение."""
+    engine = create_async_engine(url, echo=False)
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+    if engine.dialect.name != "sqlite":
+        return engine
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+    if read_only:
+        pragmas["query_only"] = "ON"
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
 
 Base = declarative_base()
-engine = create_async_engine(DATABASE_URL, echo=False)
+engine = make_engine()
 async_session = async_sessionmaker(bind=engine, expire_on_commit=False)
 
+# Отдельный пул только для чтения — для отчётов и просмотра базы (handlers/view)
+read_engine = make_engine(read_only=True)
+async_read_session = async_sessionmaker(bind=read_engine, expire_on_commit=False)
+
 async def init_db():
+    import database.models  # noqa: F401  — регистрируем таблицы в Base.metadata
+
     db_logger.info("Инициализация базы данных...")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
         db_logger.info("✅ Таблицы успешно созданы")
+
+    from database.migrations import run_migrations
+    from database.totals import ensure_team_totals
+
+    async with engine.connect() as conn:
+        version = await conn.run_sync(run_migrations)
+        db_logger.info(f"✅ Версия схемы: {version}")
+
+    async with async_session() as session:
+        await ensure_team_totals(session)
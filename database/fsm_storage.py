@@ -0,0 +1,221 @@
+"""
+FSM-хранилище в той же SQLite-базе (таблица fsm_states).
+
+Чтения обслуживаются из кэша в памяти процесса. Ключи, у которых в базе есть
+строка, читаются один раз при первом обращении (список ключей — одним запросом
+на старте); для остальных сразу отдаётся пустое состояние без похода в базу и
+без записи в кэш. Это важно: FSMContextMiddleware спрашивает get_state на
+каждый апдейт ещё до AdminMiddleware, и сообщения посторонних не должны ни
+читать SQLite, ни занимать память.
+
+Чистые записи живут в LRU на cache_size ключей. Записи (set_state / set_data /
+update_data) делают ключ «грязным» — такие записи закреплены в памяти, пока
+фоновая задача не сбросит их одной транзакцией: раз в flush_interval секунд
+или сразу, как только грязных ключей стало batch_size. При остановке бота
+close() дописывает остаток, так что рестарт не выкидывает админов из
+середины сценария.
+"""
+import asyncio
+import contextvars
+import copy
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Mapping
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from database.db import async_session
+from database.models import FSMRecord
+from logger import db_logger
+from utils.cache import LRUCache
+
+
+@dataclass
+class _Record:
+    state: str | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+class SQLiteStorage(BaseStorage):
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = async_session,
+        flush_interval: float = 0.5,
+        batch_size: int = 50,
+        cache_size: int = 1024,
+    ):
+        self._session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._records = LRUCache(maxsize=cache_size)  # чистые записи
+        self._dirty: dict[str, _Record] = {}  # ещё не сброшенные — не вытесняются
+        self._inflight: dict[str, _Record] = {}  # сбрасываются прямо сейчас, до коммита
+        self._persisted: set[str] | None = None  # ключи со строкой в fsm_states
+        self._load_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._batch_task: asyncio.Task | None = None
+
+        # Счётчики для бенчмарков/диагностики
+        self.writes = 0
+        self.flushes = 0
+
+    @staticmethod
+    def _make_key(key: StorageKey) -> str:
+        return ":".join(
+            str(part)
+            for part in (
+                key.bot_id,
+                key.chat_id,
+                key.user_id,
+                key.thread_id,
+                key.business_connection_id,
+                key.destiny,
+            )
+        )
+
+    async def _load_persisted(self) -> set[str]:
+        async with self._load_lock:
+            if self._persisted is None:
+                async with self._session_factory() as session:
+                    keys = (await session.execute(select(FSMRecord.key))).scalars().all()
+                self._persisted = set(keys)
+        return self._persisted
+
+    def _cached(self, db_key: str) -> _Record | None:
+        record = self._dirty.get(db_key)
+        if record is None:
+            record = self._inflight.get(db_key)
+        return record if record is not None else self._records.get(db_key)
+
+    async def _get_record(self, key: StorageKey) -> tuple[str, _Record]:
+        """Запись ключа; пустая запись без строки в базе не кэшируется."""
+        db_key = self._make_key(key)
+        record = self._cached(db_key)
+        if record is not None:
+            return db_key, record
+
+        persisted = self._persisted if self._persisted is not None else await self._load_persisted()
+        if db_key not in persisted:
+            return db_key, _Record()
+
+        async with self._session_factory() as session:
+            row = await session.get(FSMRecord, db_key)
+
+        # Пока ждали базу, ключ мог успеть записаться — не затираем его
+        record = self._cached(db_key)
+        if record is not None:
+            return db_key, record
+        if row is None:
+            return db_key, _Record()
+        record = _Record(state=row.state, data=json.loads(row.data))
+        self._records.set(db_key, record)
+        return db_key, record
+
+    def _mark_dirty(self, db_key: str, record: _Record) -> None:
+        self.writes += 1
+        self._dirty[db_key] = record
+        self._records.pop(db_key)
+
+        # Сброс общий для всех ключей: задачи не наследуют контекст апдейта,
+        # который их запустил (поля лога, UnitOfWork)
+        if len(self._dirty) >= self.batch_size and (self._batch_task is None or self._batch_task.done()):
+            self._batch_task = asyncio.create_task(self.flush(), context=contextvars.Context())
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later(), context=contextvars.Context())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Записывает все грязные ключи одной транзакцией."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            # До коммита записи видны через _inflight: иначе чтение в этом окне
+            # ушло бы в базу за старой строкой, а update_data затёр бы состояние
+            records, self._dirty = self._dirty, {}
+            self._inflight = records
+
+            now = datetime.utcnow()
+            upserts, removed = [], []
+            for db_key, record in records.items():
+                if record.state is None and not record.data:
+                    removed.append(db_key)
+                else:
+                    upserts.append(
+                        {
+                            "key": db_key,
+                            "state": record.state,
+                            "data": json.dumps(record.data, ensure_ascii=False),
+                            "updated_at": now,
+                        }
+                    )
+
+            try:
+                async with self._session_factory() as session:
+                    if upserts:
+                        stmt = insert(FSMRecord)
+                        await session.execute(
+                            stmt.on_conflict_do_update(
+                                index_elements=[FSMRecord.key],
+                                set_={
+                                    "state": stmt.excluded.state,
+                                    "data": stmt.excluded.data,
+                                    "updated_at": stmt.excluded.updated_at,
+                                },
+                            ),
+                            upserts,
+                        )
+                    if removed:
+                        await session.execute(delete(FSMRecord).where(FSMRecord.key.in_(removed)))
+                    await session.commit()
+            except Exception:
+                # Вернём ключи в очередь — попробуем при следующем сбросе
+                for db_key, record in records.items():
+                    self._dirty.setdefault(db_key, record)
+                self._inflight = {}
+                db_logger.exception("❌ Не удалось сохранить состояния FSM")
+                return
+
+            self._inflight = {}
+            self.flushes += 1
+            if self._persisted is not None:
+                self._persisted.update(row["key"] for row in upserts)
+                self._persisted.difference_update(removed)
+            # Сброшенные записи становятся чистыми и могут вытесняться; пустые не храним
+            for row in upserts:
+                if row["key"] not in self._dirty:
+                    self._records.set(row["key"], records[row["key"]])
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        db_key, record = await self._get_record(key)
+        record.state = state.state if isinstance(state, State) else state
+        self._mark_dirty(db_key, record)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        _, record = await self._get_record(key)
+        return record.state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            raise TypeError(f"Data must be a dict, not {type(data).__name__}")
+        db_key, record = await self._get_record(key)
+        record.data = copy.copy(data)
+        self._mark_dirty(db_key, record)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        _, record = await self._get_record(key)
+        return copy.copy(record.data)
+
+    async def close(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
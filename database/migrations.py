@@ -0,0 +1,90 @@
+"""
+Версионные миграции схемы для уже существующих баз.
+
+create_all создаёт только отсутствующие таблицы, поэтому всё, что меняет
+живые таблицы (индексы, новые колонки), описывается здесь. Применённая
+версия хранится в таблице schema_migrations; init_db при старте накатывает
+все миграции с номером больше текущего, каждую в своей транзакции.
+
+Новая миграция — функция от синхронного Connection, добавленная в конец
+MIGRATIONS со следующим номером. Миграции должны быть идемпотентны: на
+свежей базе create_all уже создал всё по моделям.
+"""
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import Connection, inspect, text
+
+from logger import db_logger
+
+SCHEMA_TABLE = "schema_migrations"
+
+
+def create_index(conn: Connection, name: str, table: str, *columns: str) -> None:
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+
+def add_column(conn: Connection, table: str, column: str, ddl: str) -> None:
+    """ALTER TABLE ... ADD COLUMN, если такой колонки ещё нет."""
+    existing = {col["name"] for col in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def _hot_path_indexes(conn: Connection) -> None:
+    # Команды субботника: пикер команд, отчёт, выгрузка
+    create_index(conn, "ix_teams_event_id", "teams", "event_id")
+    # Начисления команды по категории; префикс team_id покрывает и выборку
+    # всех баллов команды, поэтому отдельный индекс на team_id не нужен
+    create_index(conn, "ix_scores_team_id_category", "scores", "team_id", "category")
+    # Списки субботников (сначала новые)
+    create_index(conn, "ix_events_created_at", "events", "created_at")
+
+
+def _score_count(conn: Connection) -> None:
+    # N мешков одной записью; старые строки — по одному мешку, так что
+    # team_category_totals.entries (= сумма count) пересобирать не нужно
+    add_column(conn, "scores", "count", "INTEGER NOT NULL DEFAULT 1")
+
+
+def _drop_team_totals(conn: Connection) -> None:
+    # Общий итог команды считается суммой team_category_totals, отдельная
+    # таблица только дублировала каждую запись баллов
+    conn.execute(text("DROP TABLE IF EXISTS team_totals"))
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "hot-path indexes", _hot_path_indexes),
+    (2, "scores.count", _score_count),
+    (3, "drop team_totals", _drop_team_totals),
+]
+
+
+def current_version(conn: Connection) -> int:
+    return conn.execute(text(f"SELECT COALESCE(MAX(version), 0) FROM {SCHEMA_TABLE}")).scalar_one()
+
+
+def run_migrations(conn: Connection) -> int:
+    """Накатывает недостающие миграции; возвращает итоговую версию схемы."""
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA_TABLE} ("
+            "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at DATETIME NOT NULL)"
+        )
+    )
+    conn.commit()
+
+    version = current_version(conn)
+    for number, name, migrate in MIGRATIONS:
+        if number <= version:
+            continue
+        migrate(conn)
+        conn.execute(
+            text(f"INSERT INTO {SCHEMA_TABLE} (version, name, applied_at) VALUES (:v, :n, :t)"),
+            {"v": number, "n": name, "t": datetime.utcnow()},
+        )
+        conn.commit()
+        db_logger.info(f"🧱 Миграция {number} применена: {name}")
+        version = number
+
+    return version
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database.db import Base
@@ -26,6 +26,8 @@ class Event(Base):
 
     teams = relationship("Team", back_populates="event")
 
+    __table_args__ = (Index("ix_events_created_at", "created_at"),)
+
 class Team(Base):
     __tablename__ = "teams"
 
@@ -36,15 +38,65 @@ class Team(Base):
     event = relationship("Event", back_populates="teams")
     scores: Mapped[list["Score"]] = relationship(back_populates="team", cascade="all, delete-orphan")
 
+    __table_args__ = (Index("ix_teams_event_id", "event_id"),)
+
 
 class Score(Base):
+    """
+    Журнал начислений: только добавление, вычитание — строка с минусом.
+    Баланс по (команда, категория) — в team_category_totals; старые строки
+    журнала переезжают в scores_archive (database/compaction.py).
+    """
     __tablename__ = "scores"
 
     id: Mapped[int] = mapped_column(primary_key=True)
     team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), nullable=False)
     category: Mapped[str] = mapped_column(nullable=False)
-    points: Mapped[int] = mapped_column(default=0, nullable=False)
+    points: Mapped[int] = mapped_column(default=0, nullable=False)  # за все `count` единиц
+    count: Mapped[int] = mapped_column(default=1, server_default="1", nullable=False)  # мешков в записи
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
     team: Mapped["Team"] = relationship(back_populates="scores")
 
+    __table_args__ = (Index("ix_scores_team_id_category", "team_id", "category"),)
+
+
+class ScoreArchive(Base):
+    """Строки журнала scores, уже свёрнутые в балансы, — сырая история."""
+    __tablename__ = "scores_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # id строки в scores; SQLite может выдать его снова, когда журнал опустеет
+    score_id: Mapped[int] = mapped_column(nullable=False)
+    team_id: Mapped[int] = mapped_column(nullable=False)
+    category: Mapped[str] = mapped_column(nullable=False)
+    points: Mapped[int] = mapped_column(nullable=False)
+    count: Mapped[int] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column()
+    archived_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+    __table_args__ = (Index("ix_scores_archive_team_id_category", "team_id", "category"),)
+
+
+class TeamCategoryTotal(Base):
+    """
+    Баланс команды по категории: сумма баллов и число мешков (сумма count)
+    по scores и scores_archive. Ровно одна строка на (team_id, category) —
+    уникальность даёт первичный ключ, обновление идёт через UPSERT.
+    """
+    __tablename__ = "team_category_totals"
+
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), primary_key=True)
+    category: Mapped[str] = mapped_column(primary_key=True)
+    points: Mapped[int] = mapped_column(default=0, nullable=False)
+    entries: Mapped[int] = mapped_column(default=0, nullable=False)
+
+
+class FSMRecord(Base):
+    """Состояние FSM одного пользователя/чата (см. database/fsm_storage.py)."""
+    __tablename__ = "fsm_states"
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    state: Mapped[str | None] = mapped_column(nullable=True)
+    data: Mapped[str] = mapped_column(default="{}", nullable=False)  # JSON
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Select, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import Event, Team
+
+
+@dataclass(frozen=True)
+class Page:
+    """Одна страница выборки и её положение в общем списке."""
+
+    items: list[Any]
+    page: int
+    total_pages: int
+
+    @property
+    def first_key(self) -> Any:
+        return self.items[0].id if self.items else None
+
+    @property
+    def last_key(self) -> Any:
+        return self.items[-1].id if self.items else None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.page > 1
+
+    @property
+    def has_next(self) -> bool:
+        return self.page < self.total_pages
+
+
+def total_pages_for(total: int, per_page: int) -> int:
+    return max(1, (total + per_page - 1) // per_page)
+
+
+async def fetch_keyset_page(
+    session: AsyncSession,
+    stmt: Select,
+    key_column,
+    *,
+    limit: int,
+    after: Any = None,
+    before: Any = None,
+) -> list[Any]:
+    """
+    Достаём ровно одну страницу по ключу (keyset), без OFFSET:
+    after — следующая страница после ключа, before — предыдущая перед ключом.
+    """
+    if before is not None:
+        stmt = stmt.where(key_column < before).order_by(key_column.desc()).limit(limit)
+        result = await session.execute(stmt)
+        return list(reversed(result.scalars().all()))
+
+    if after is not None:
+        stmt = stmt.where(key_column > after)
+    stmt = stmt.order_by(key_column).limit(limit)
+    result = await session.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def count_event_teams(session: AsyncSession, event_id: int) -> int:
+    stmt = select(func.count(Team.id)).where(Team.event_id == event_id)
+    return (await session.execute(stmt)).scalar_one()
+
+
+async def get_event_teams_page(
+    session: AsyncSession,
+    event_id: int,
+    *,
+    page: int = 1,
+    per_page: int,
+    after_id: int | None = None,
+    before_id: int | None = None,
+) -> Page:
+    """Страница команд субботника, упорядоченных по Team.id."""
+    total = await count_event_teams(session, event_id)
+    teams = await fetch_keyset_page(
+        session,
+        select(Team).where(Team.event_id == event_id),
+        Team.id,
+        limit=per_page,
+        after=after_id,
+        before=before_id,
+    )
+    total_pages = total_pages_for(total, per_page)
+    return Page(items=teams, page=min(max(page, 1), total_pages), total_pages=total_pages)
+
+
+def _event_key(event_id: int):
+    """Ключ (created_at, id) субботника для сравнения кортежей в SQL."""
+    created_at = select(Event.created_at).where(Event.id == event_id).scalar_subquery()
+    return tuple_(created_at, literal(event_id))
+
+
+async def get_events_page(
+    session: AsyncSession,
+    *,
+    page: int = 1,
+    per_page: int,
+    after_id: int | None = None,
+    before_id: int | None = None,
+) -> Page:
+    """
+    Страница субботников от новых к старым. Keyset по (created_at, id):
+    в callback_data хватает id крайнего субботника, дата подтягивается подзапросом.
+    """
+    total = (await session.execute(select(func.count(Event.id)))).scalar_one()
+    key = tuple_(Event.created_at, Event.id)
+
+    if before_id is not None:
+        stmt = (
+            select(Event)
+            .where(key > _event_key(before_id))
+            .order_by(Event.created_at, Event.id)
+            .limit(per_page)
+        )
+        events = list(reversed((await session.execute(stmt)).scalars().all()))
+    else:
+        stmt = select(Event)
+        if after_id is not None:
+            stmt = stmt.where(key < _event_key(after_id))
+        stmt = stmt.order_by(Event.created_at.desc(), Event.id.desc()).limit(per_page)
+        events = list((await session.execute(stmt)).scalars().all())
+
+    total_pages = total_pages_for(total, per_page)
+    return Page(items=events, page=min(max(page, 1), total_pages), total_pages=total_pages)
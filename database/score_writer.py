@@ -0,0 +1,240 @@
+"""
+Очередь записи баллов с групповыми коммитами.
+
+Хендлеры не коммитят каждое начисление сами, а ставят изменение в очередь и
+ждут подтверждения (await). Фоновая задача забирает из очереди пачку — до
+max_batch изменений или всё, что пришло за max_delay секунд, — и записывает
+её одной транзакцией: один fsync SQLite на пачку вместо одного на нажатие.
+
+Если пачка целиком не записалась, изменения повторяются по одному, чтобы
+ошибка одного не откатывала соседей. stop() дописывает очередь до конца.
+"""
+import asyncio
+import contextvars
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from database.db import async_session
+from database.models import Score
+from database.totals import apply_score_delta, team_category_balance_stmt
+from logger import db_logger, log_context
+from utils.constants import CATEGORIES
+
+
+@dataclass
+class AddScore:
+    team_id: int
+    category: str
+    points: int  # за все count единиц
+    count: int = 1
+    # Своего apply нет: подряд идущие начисления пишет пачкой ScoreWriter._insert_scores
+
+
+@dataclass
+class SubtractScore:
+    team_id: int
+    category: str
+    amount: int
+
+    async def apply(self, session: AsyncSession) -> int | None:
+        """
+        Сколько баллов реально вычтено (не больше баланса); None — баллов по
+        категории нет. Читает одну строку баланса, в журнал дописывает строку
+        с минусом.
+
+        Мешки (entries) следуют за баллами так:
+        - баллы кончились — категория снимается целиком, вместе с мешками;
+        - категория «fixed» (баллы за мешок) — мешков остаётся столько, сколько
+          покрывает остаток баллов, с округлением вверх: 25 баллов металла по
+          10 за мешок — 3 мешка;
+        - категории с баллами по выбору (count_each) — число единиц не меняется:
+          вычитание правит оценку, а не количество сданных предметов.
+        """
+        balance = (await session.execute(team_category_balance_stmt(self.team_id, self.category))).first()
+        if balance is None or balance.points <= 0:
+            return None
+
+        subtracted = min(self.amount, balance.points)
+        remaining = balance.points - subtracted
+        _, per_bag, count_type = CATEGORIES.get(self.category, (None, None, None))
+        if remaining == 0:
+            entries = -balance.entries
+        elif count_type == "fixed":
+            entries = min(0, -(-remaining // per_bag) - balance.entries)
+        else:
+            entries = 0
+
+        session.add(Score(team_id=self.team_id, category=self.category, points=-subtracted, count=entries))
+        await apply_score_delta(session, self.team_id, self.category, -subtracted, entries)
+        return subtracted
+
+
+class ScoreWriter:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = async_session,
+        max_batch: int = 50,
+        max_delay: float = 0.005,
+    ):
+        self._session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+
+        self.commits = 0
+        self.mutations = 0
+        self.max_queue_depth = 0
+        self._started_at = time.monotonic()
+
+    async def add_score(self, team_id: int, category: str, points: int, count: int = 1) -> None:
+        """points — за все count единиц, одной строкой scores."""
+        await self.submit(AddScore(team_id, category, points, count))
+
+    async def subtract_score(self, team_id: int, category: str, amount: int) -> int | None:
+        return await self.submit(SubtractScore(team_id, category, amount))
+
+    async def submit(self, mutation):
+        """Ставит изменение в очередь и ждёт, пока его транзакция закоммитится."""
+        if self._worker is None or self._worker.done():
+            # Воркер общий для всех апдейтов: не наследуем контекст первого из них
+            # (поля лога, UnitOfWork), каждому изменению — свой контекст лога
+            self._worker = asyncio.create_task(self._run(), context=contextvars.Context())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((mutation, future, log_context.get()))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return await future
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict[str, float]:
+        uptime = max(time.monotonic() - self._started_at, 1e-9)
+        return {
+            "commits": self.commits,
+            "mutations": self.mutations,
+            "commits_per_sec": self.commits / uptime,
+            "avg_batch": self.mutations / self.commits if self.commits else 0.0,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+    async def stop(self) -> None:
+        """Дожидается записи всего, что уже стоит в очереди."""
+        if self._worker is not None and not self._worker.done():
+            self._queue.put_nowait(None)
+            await self._worker
+        db_logger.info(f"🧮 Очередь баллов остановлена: {self.stats()}")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+
+            batch, stopping = [item], False
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout > 0:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    else:
+                        item = self._queue.get_nowait()
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._write(batch)
+            if stopping:
+                return
+
+    async def _write(self, batch: list) -> None:
+        try:
+            results = await self._apply(batch)
+        except Exception as error:
+            if len(batch) > 1:
+                # Пачка не прошла — пишем по одному, чтобы найти виновника
+                for item in batch:
+                    await self._write([item])
+                return
+
+            mutation, future, fields = batch[0]
+            token = log_context.set(fields)
+            try:
+                db_logger.exception(f"❌ Не удалось записать {mutation}")
+            finally:
+                log_context.reset(token)
+            if not future.done():
+                future.set_exception(error)
+            return
+
+        for (mutation, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _apply(self, batch: list) -> list:
+        results = []
+        async with self._session_factory() as session:
+            # Подряд идущие начисления пишем одним INSERT и одним обновлением
+            # итогов на каждую пару (команда, категория)
+            pending: list[AddScore] = []
+            for mutation, _, _ in batch:
+                if isinstance(mutation, AddScore):
+                    pending.append(mutation)
+                    continue
+                await self._insert_scores(session, pending)
+                results.extend([None] * len(pending))
+                pending = []
+                results.append(await mutation.apply(session))
+
+            await self._insert_scores(session, pending)
+            results.extend([None] * len(pending))
+            await session.commit()
+
+        self.commits += 1
+        self.mutations += len(batch)
+        return results
+
+    @staticmethod
+    async def _insert_scores(session: AsyncSession, adds: list[AddScore]) -> None:
+        if not adds:
+            return
+
+        now = datetime.utcnow()
+        await session.execute(
+            insert(Score),
+            [
+                {
+                    "team_id": a.team_id,
+                    "category": a.category,
+                    "points": a.points,
+                    "count": a.count,
+                    "created_at": now,
+                }
+                for a in adds
+            ],
+        )
+
+        deltas: dict[tuple[int, str], list[int]] = defaultdict(lambda: [0, 0])
+        for a in adds:
+            delta = deltas[(a.team_id, a.category)]
+            delta[0] += a.points
+            delta[1] += a.count
+        for (team_id, category), (points, entries) in deltas.items():
+            await apply_score_delta(session, team_id, category, points, entries)
+
+
+score_writer = ScoreWriter()
@@ -0,0 +1,186 @@
+"""
+Материализованные итоги команд: team_category_totals.
+
+Обновляются в той же транзакции, что и запись в scores, поэтому отчёты
+читают O(команд × категорий) строк вместо всех начислений; общий итог
+команды — сумма её строк (event_ranking_stmt). team_category_totals — это
+и есть баланс (команда, категория): журнал scores сворачивается в него при
+записи, а старые строки журнала уходят в scores_archive. Пересборка с нуля
+по журналу и архиву:
+
+    python -m database.totals
+"""
+import asyncio
+from dataclasses import dataclass
+
+from sqlalchemy import Select, case, delete, func, insert, select, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import Score, ScoreArchive, Team, TeamCategoryTotal
+from logger import db_logger
+from utils.constants import CATEGORIES
+
+
+@dataclass
+class RankedTeam:
+    position: int  # место в таблице (ROW_NUMBER: total desc, id asc)
+    rank: int  # место с учётом равенства баллов (RANK)
+    team_id: int
+    name: str
+    total: int
+    entries: int  # мешков / единиц по всем категориям
+    # category -> баллы, в порядке CATEGORIES
+    points: dict[str, int]
+
+
+async def apply_score_delta(
+    session: AsyncSession,
+    team_id: int,
+    category: str,
+    points: int,
+    entries: int,
+) -> None:
+    """Добавляет изменение к итогам команды. Коммит — на стороне вызывающего."""
+    stmt = sqlite_insert(TeamCategoryTotal).values(
+        team_id=team_id, category=category, points=points, entries=entries
+    )
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[TeamCategoryTotal.team_id, TeamCategoryTotal.category],
+            set_={
+                "points": TeamCategoryTotal.points + stmt.excluded.points,
+                "entries": TeamCategoryTotal.entries + stmt.excluded.entries,
+            },
+        )
+    )
+    if entries < 0:
+        # Последнее начисление по категории снято — строка больше не нужна
+        await session.execute(
+            delete(TeamCategoryTotal).where(
+                TeamCategoryTotal.team_id == team_id,
+                TeamCategoryTotal.category == category,
+                TeamCategoryTotal.entries <= 0,
+            )
+        )
+
+
+def ledger_rows():
+    """Весь журнал начислений: живые строки scores и архив."""
+    columns = ("team_id", "category", "points", "count")
+    return union_all(
+        select(*(getattr(Score, c) for c in columns)),
+        select(*(getattr(ScoreArchive, c) for c in columns)),
+    ).subquery("ledger")
+
+
+async def rebuild_team_totals(session: AsyncSession) -> None:
+    """Пересобирает балансы из журнала (scores + scores_archive)."""
+    await session.execute(delete(TeamCategoryTotal))
+
+    ledger = ledger_rows()
+    await session.execute(
+        insert(TeamCategoryTotal).from_select(
+            ["team_id", "category", "points", "entries"],
+            select(ledger.c.team_id, ledger.c.category, func.sum(ledger.c.points), func.sum(ledger.c.count))
+            .group_by(ledger.c.team_id, ledger.c.category)
+            # Категория, обнулённая вычитанием, баланса не имеет
+            .having(func.sum(ledger.c.count) > 0),
+        )
+    )
+    db_logger.info("🔄 Итоги команд пересобраны из журнала баллов")
+
+
+async def ensure_team_totals(session: AsyncSession) -> None:
+    """Заполняет балансы, если таблица только что появилась в старой базе."""
+    has_totals = (await session.execute(select(TeamCategoryTotal.team_id).limit(1))).first()
+    has_scores = (await session.execute(select(ledger_rows().c.team_id).limit(1))).first()
+    if has_scores and not has_totals:
+        await rebuild_team_totals(session)
+        await session.commit()
+
+
+def event_ranking_stmt(event_id: int) -> Select:
+    """
+    Один GROUP BY по итогам категорий: баллы по каждой категории (колонка на
+    ключ CATEGORIES), общий итог и место, посчитанное окнами SQLite.
+    """
+    tct = TeamCategoryTotal
+    total = func.coalesce(func.sum(tct.points), 0)
+    per_category = [
+        func.coalesce(func.sum(case((tct.category == key, tct.points), else_=0)), 0).label(key)
+        for key in CATEGORIES
+    ]
+    return (
+        select(
+            func.row_number().over(order_by=(total.desc(), Team.id)).label("position"),
+            func.rank().over(order_by=total.desc()).label("rank"),
+            Team.id,
+            Team.name,
+            total.label("total"),
+            func.coalesce(func.sum(tct.entries), 0).label("entries"),
+            *per_category,
+        )
+        .select_from(Team)
+        .outerjoin(tct, tct.team_id == Team.id)
+        .where(Team.event_id == event_id)
+        .group_by(Team.id)
+        .order_by("position")
+    )
+
+
+def team_balances_stmt(team_id: int) -> Select:
+    """Балансы команды: по строке (категория, баллы) на категорию."""
+    return (
+        select(TeamCategoryTotal.category, TeamCategoryTotal.points)
+        .where(TeamCategoryTotal.team_id == team_id)
+        .order_by(TeamCategoryTotal.category)
+    )
+
+
+def team_category_balance_stmt(team_id: int, category: str) -> Select:
+    """Одна строка баланса (баллы, мешки) по первичному ключу."""
+    return select(TeamCategoryTotal.points, TeamCategoryTotal.entries).where(
+        TeamCategoryTotal.team_id == team_id, TeamCategoryTotal.category == category
+    )
+
+
+async def get_event_ranking(session: AsyncSession, event_id: int) -> list[RankedTeam]:
+    result = await session.execute(event_ranking_stmt(event_id))
+    return [
+        RankedTeam(
+            position=position,
+            rank=rank,
+            team_id=team_id,
+            name=name,
+            total=total,
+            entries=entries,
+            points=dict(zip(CATEGORIES, category_points)),
+        )
+        for position, rank, team_id, name, total, entries, *category_points in result.all()
+    ]
+
+
+async def get_event_bag_totals(session: AsyncSession, event_id: int) -> dict[str, int]:
+    """Количество мешков (сумма scores.count) по каждой категории за весь субботник."""
+    stmt = (
+        select(TeamCategoryTotal.category, func.sum(TeamCategoryTotal.entries))
+        .join(Team, Team.id == TeamCategoryTotal.team_id)
+        .where(Team.event_id == event_id)
+        .group_by(TeamCategoryTotal.category)
+    )
+    return dict((await session.execute(stmt)).all())
+
+
+async def _main():
+    from database.db import async_session, engine, init_db
+
+    await init_db()
+    async with async_session() as session:
+        await rebuild_team_totals(session)
+        await session.commit()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -5,18 +5,20 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardMarkup
 from sqlalchemy import select
 
-from database.db import async_session
 from database.models import User
+from handlers.routing import callbacks
 from logger import app_logger
+from middlewares.db_session import UnitOfWork
 from states.add_admin import AddAdmin
+from utils.admins import invalidate_admins
 from utils.keyboards import back_button
 
-router = Router()
+router = Router(name="add_admin")
 
 kb = InlineKeyboardMarkup(inline_keyboard=[*back_button('back_to_main')])
 
 # Обработка нажатия кнопки "Добавить админа"
-@router.callback_query(lambda c: c.data == "add_admin_instruction")
+@callbacks("add_admin_instruction")
 async def ask_for_username(callback: types.CallbackQuery, state: FSMContext):
     await callback.answer()
     await state.set_state(AddAdmin.waiting_for_username)
@@ -25,7 +27,7 @@ async def ask_for_username(callback: types.CallbackQuery, state: FSMContext):
 
 # Обработка ввода username
 @router.message(StateFilter(AddAdmin.waiting_for_username))
-async def process_username(message: types.Message, state: FSMContext):
+async def process_username(message: types.Message, state: FSMContext, uow: UnitOfWork):
     if not message.text:
         await message.answer("⚠️ Введите текст — username пользователя.", reply_markup=kb)
         return
@@ -39,25 +41,25 @@ async def process_username(message: types.Message, state: FSMContext):
         await message.answer("⚠️ Username не может быть пустым.", reply_markup=kb)
         return
 
-    async with async_session() as session:
-        stmt = select(User).where(User.username.ilike(raw_username))
-        result = await session.execute(stmt)
-        user: User | None = result.scalar_one_or_none()
-
-        if user is None:
-            await message.answer(
-                f"❌ Пользователь с username `{raw_username}` не найден в базе.",
-                parse_mode="HTML", reply_markup=kb
-            )
-        elif bool(user.is_admin):
-            await message.answer("⚠️ Этот пользователь уже является админом.", reply_markup=kb)
-        else:
-            user.is_admin = True
-            await session.commit()
-            app_logger.info(f"🔐 Добавлен админ: {user.telegram_id} | @{user.username or '-'} — добавил: {message.from_user.id} | @{message.from_user.username or '-'}") # type:ignore
-            await message.answer(
-                f"✅ Пользователь @{user.username} теперь админ!",
-                parse_mode="HTML", reply_markup=kb
-            )
+    stmt = select(User).where(User.username.ilike(raw_username))
+    result = await uow.session.execute(stmt)
+    user: User | None = result.scalar_one_or_none()
+
+    if user is None:
+        await message.answer(
+            f"❌ Пользователь с username `{raw_username}` не найден в базе.",
+            parse_mode="HTML", reply_markup=kb
+        )
+    elif bool(user.is_admin):
+        await message.answer("⚠️ Этот пользователь уже является админом.", reply_markup=kb)
+    else:
+        user.is_admin = True
+        await uow.commit()
+        invalidate_admins()
+        app_logger.info(f"🔐 Добавлен админ: {user.telegram_id} | @{user.username or '-'} — добавил: {message.from_user.id} | @{message.from_user.username or '-'}") # type:ignore
+        await message.answer(
+            f"✅ Пользователь @{user.username} теперь админ!",
+            parse_mode="HTML", reply_markup=kb
+        )
 
     await state.clear()
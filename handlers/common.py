@@ -1,12 +1,11 @@
-from aiogram import Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery
 
+from handlers.routing import callbacks
 from utils.keyboards import main_menu_kb
 
-router = Router()
 
-@router.callback_query(lambda c: c.data == "back_to_main")
+@callbacks("back_to_main")
 async def back_to_main(callback: CallbackQuery, state: FSMContext):
     await state.clear()
     await callback.answer()
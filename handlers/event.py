@@ -5,17 +5,20 @@ from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardMarkup, Message
 
-from database.db import async_session
 from database.models import Event
+from handlers.routing import callbacks
 from logger import app_logger
+from middlewares.db_session import UnitOfWork
 from states.event import EventStates
+from utils.cache import teams_view_cache
+from utils.entities import invalidate_event
 from utils.keyboards import back_button
 
-router = Router()
+router = Router(name="event")
 
 kb = InlineKeyboardMarkup(inline_keyboard=[*back_button('back_to_main')])
 
-@router.callback_query(lambda c: c.data == "create_event")
+@callbacks("create_event")
 async def handle_create_event_callback(callback: types.CallbackQuery, state: FSMContext):
     await callback.answer()
 
@@ -35,7 +38,7 @@ async def create_event(message: Message, state: FSMContext):
 
 # 📝 Обработка названия субботника
 @router.message(StateFilter(EventStates.waiting_for_title))
-async def process_event_title(message: Message, state: FSMContext):
+async def process_event_title(message: Message, state: FSMContext, uow: UnitOfWork):
     if not message.text:
         await message.answer("Название субботника не может быть пустым.", reply_markup=kb)
         return
@@ -44,16 +47,16 @@ async def process_event_title(message: Message, state: FSMContext):
 
     telegram_id = message.from_user.id #type: ignore
 
-    async with async_session() as session:
-        new_event = Event(
-            title=title,
-            created_by=telegram_id,
-            created_at=datetime.utcnow()
-        )
-        session.add(new_event)
-        await session.commit()
-        app_logger.info(f"📅 Субботник создан: '{title}' | админ {telegram_id} | @{message.from_user.username or '-'}") # type: ignore
-
+    new_event = Event(
+        title=title,
+        created_by=telegram_id,
+        created_at=datetime.utcnow()
+    )
+    uow.session.add(new_event)
+    await uow.commit()
+    teams_view_cache.clear()
+    invalidate_event(new_event.id)
+    app_logger.info(f"📅 Субботник создан: '{title}' | админ {telegram_id} | @{message.from_user.username or '-'}") # type: ignore
 
     await message.answer(
     f"✅ Субботник <b>{title}</b> успешно создан!\nID: <code>{new_event.id}</code>",
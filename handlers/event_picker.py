@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.pagination import get_events_page
+from handlers.routing import callbacks
+from middlewares.db_session import UnitOfWork
+from utils.callback_data import EventsPage
+from utils.keyboards import back_button
+
+EVENTS_PER_PAGE = 8  # Кол-во субботников на одной странице выбора
+
+# prefix → пикер, чтобы один хендлер листал страницы для всех сценариев
+_pickers: dict[str, "EventPicker"] = {}
+
+
+@dataclass(frozen=True)
+class EventPicker:
+    """
+    Постраничный выбор субботника. Кнопки субботников шлют payload(event_id=...),
+    навигация — EventsPage с prefix этого payload.
+    back — callback кнопки «🔙 Назад» под списком (None — без неё).
+    Клавиатура читает через переданную сессию апдейта (uow.read).
+    """
+
+    payload: type[CallbackData]
+    back: str | None = None
+    per_page: int = EVENTS_PER_PAGE
+
+    def __post_init__(self):
+        _pickers[self.prefix] = self
+
+    @property
+    def prefix(self) -> str:
+        return self.payload.__prefix__
+
+    async def keyboard(
+        self,
+        session: AsyncSession,
+        page: int = 1,
+        after_id: int | None = None,
+        before_id: int | None = None,
+    ) -> InlineKeyboardMarkup | None:
+        """Клавиатура страницы; None, если субботников ещё нет."""
+        events_page = await get_events_page(
+            session, page=page, per_page=self.per_page, after_id=after_id, before_id=before_id
+        )
+
+        if not events_page.items:
+            return None
+
+        buttons = [
+            [InlineKeyboardButton(text=event.title, callback_data=self.payload(event_id=event.id).pack())]
+            for event in events_page.items
+        ]
+
+        page = events_page.page
+        nav_buttons = []
+        if events_page.has_prev:
+            nav_buttons.append(
+                InlineKeyboardButton(
+                    text="⬅️ Назад",
+                    callback_data=EventsPage(
+                        picker=self.prefix, page=page - 1, direction="prev", cursor=events_page.first_key
+                    ).pack(),
+                )
+            )
+        if events_page.has_next:
+            nav_buttons.append(
+                InlineKeyboardButton(
+                    text="➡️ Далее",
+                    callback_data=EventsPage(
+                        picker=self.prefix, page=page + 1, direction="next", cursor=events_page.last_key
+                    ).pack(),
+                )
+            )
+        if nav_buttons:
+            buttons.append(nav_buttons)
+
+        if self.back:
+            buttons.extend(back_button(self.back))
+
+        return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+# 📄 Листание страниц любого пикера
+@callbacks(EventsPage)
+async def change_events_page(callback: CallbackQuery, callback_data: EventsPage, uow: UnitOfWork):
+    await callback.answer()
+    picker = _pickers.get(callback_data.picker)
+    if picker is None:
+        return
+
+    cursor_kwargs = {"after_id" if callback_data.direction == "next" else "before_id": callback_data.cursor}
+    kb = await picker.keyboard(uow.read, page=callback_data.page, **cursor_kwargs)
+
+    if kb is None:
+        # Курсор указывает на удалённый субботник — показываем первую страницу
+        kb = await picker.keyboard(uow.read)
+    if kb is None:
+        return
+
+    try:
+        await callback.message.edit_reply_markup(reply_markup=kb)  # type: ignore
+    except:
+        await callback.message.answer("Выберите субботник:", reply_markup=kb)  # type: ignore
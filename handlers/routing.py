@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from aiogram import Router
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.filters.callback_data import CallbackData
+from aiogram.fsm.state import State
+from aiogram.types import CallbackQuery
+
+from logger import bind_log_context
+from utils.constants import LEGACY_CALLBACKS
+
+STALE_TEXT = "⚠️ Кнопка устарела — начните действие заново."
+
+
+@dataclass(frozen=True)
+class CallbackRoute:
+    handler: CallableObject
+    payload: type[CallbackData] | None  # None — callback без параметров (data == prefix)
+    states: frozenset[str] | None  # None — в любом состоянии
+
+
+class CallbackRoutes:
+    """
+    Маршрутизация callback_query по префиксу вместо цепочки lambda-фильтров.
+
+    callback_data разбирается один раз: префикс (до первого ":") ищется в
+    dict, дальше проверяются только маршруты этого префикса (обычно один).
+    Хендлер получает разобранный объект в аргументе `callback_data`.
+
+        @callbacks("adjust_cancel", ScoreManageStates.confirming_delete)
+        @callbacks(ScoreTeam)
+
+    Префикс известен, но ни один маршрут не подошёл (другое состояние,
+    старый формат, снятый с выпуска префикс) — отвечаем STALE_TEXT. Неизвестный префикс пропускаем
+    дальше по роутерам.
+    """
+
+    def __init__(self):
+        self.router = Router(name="callbacks")
+        self.router.callback_query.register(self._dispatch)
+        self._routes: dict[str, list[CallbackRoute]] = {}
+        self.stale = 0
+
+    def __call__(self, key: str | type[CallbackData], *states: State) -> Callable:
+        if isinstance(key, str):
+            prefix, payload = key, None
+        else:
+            prefix, payload = key.__prefix__, key
+
+        def decorator(handler: Callable) -> Callable:
+            route = CallbackRoute(
+                handler=CallableObject(handler),
+                payload=payload,
+                states=frozenset(s.state for s in states) if states else None,  # type: ignore
+            )
+            self._routes.setdefault(prefix, []).append(route)
+            return handler
+
+        return decorator
+
+    def retire(self, *prefixes: str) -> None:
+        """Префиксы снятых с выпуска кнопок: всегда отвечаем STALE_TEXT."""
+        for prefix in prefixes:
+            self._routes.setdefault(prefix, [])
+
+    def resolve(self, data: str, raw_state: str | None) -> tuple[CallbackRoute, CallbackData | None] | None:
+        """Маршрут и разобранный payload; None — префикс известен, но ничего не подошло."""
+        prefix, sep, _ = data.partition(":")
+        routes = self._routes.get(prefix)
+        if routes is None:
+            raise KeyError(prefix)
+
+        for route in routes:
+            if route.states is not None and raw_state not in route.states:
+                continue
+            if route.payload is None:
+                if not sep:
+                    return route, None
+                continue
+            try:
+                return route, route.payload.unpack(data)
+            except (TypeError, ValueError):
+                continue
+        return None
+
+    async def _dispatch(self, callback: CallbackQuery, raw_state: str | None = None, **data: Any) -> Any:
+        try:
+            resolved = self.resolve(callback.data or "", raw_state)
+        except KeyError:
+            raise SkipHandler()
+
+        if resolved is None:
+            self.stale += 1
+            await callback.answer(STALE_TEXT)
+            return None
+
+        route, payload = resolved
+        bind_log_context(handler=route.handler.callback.__name__)
+        return await route.handler.call(callback, raw_state=raw_state, callback_data=payload, **data)
+
+
+callbacks = CallbackRoutes()
+callbacks.retire(*LEGACY_CALLBACKS)
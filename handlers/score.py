@@ -1,5 +1,5 @@
 from aiogram import Router
-from aiogram.filters import Command, StateFilter
+from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.types import (
     CallbackQuery,
@@ -7,55 +7,74 @@ from aiogram.types import (
     InlineKeyboardMarkup,
     Message,
 )
-from sqlalchemy import select
 
-from database.db import async_session
-from database.models import Event, Score, Team
+from database.pagination import Page, get_event_teams_page
+from database.score_writer import score_writer
+from handlers.event_picker import EventPicker
+from handlers.routing import callbacks
 from logger import app_logger
+from middlewares.db_session import UnitOfWork
 from states.score import ScoreStates
+from utils.cache import bump_event_version
+from utils.callback_data import (
+    ScoreBack,
+    ScoreBags,
+    ScoreCategory,
+    ScoreConfirm,
+    ScoreEvent,
+    ScorePoints,
+    ScoreQty,
+    ScoreTeam,
+    ScoreTeamPage,
+)
 from utils.constants import CATEGORIES
+from utils.entities import get_team
 from utils.keyboards import back_button, back_menu_button
 
-router = Router()
+router = Router(name="score")
 
 ITEMS_PER_PAGE = 10  # Кол-во команд на одной странице
+MAX_BAGS = 999  # Больше цифр клавиатура количества не примет
+
+event_picker = EventPicker(ScoreEvent)
 
 
-def get_score_teams_kb(
-    teams, page: int, total_pages: int, callback_base: str = "score_team"
-) -> InlineKeyboardMarkup:
+def get_score_teams_kb(teams_page: Page, event_id: int) -> InlineKeyboardMarkup:
     """
     Формируем InlineKeyboard с командами текущей страницы
     и навигационными кнопками.
     """
     buttons = []
 
-    start = (page - 1) * ITEMS_PER_PAGE
-    end = start + ITEMS_PER_PAGE
-    teams_page = teams[start:end]
-
     # Кнопки с командами
-    for team in teams_page:
+    for team in teams_page.items:
         buttons.append(
             [
                 InlineKeyboardButton(
-                    text=team.name, callback_data=f"{callback_base}:{team.id}"
+                    text=team.name, callback_data=ScoreTeam(team_id=team.id).pack()
                 )
             ]
         )
 
-    # Навигация
+    # Навигация: субботник, номер страницы и ключ-курсор едут в самой кнопке
+    page = teams_page.page
     nav_buttons = []
-    if page > 1:
+    if teams_page.has_prev:
         nav_buttons.append(
             InlineKeyboardButton(
-                text="⬅️ Назад", callback_data=f"score_team_page:{page - 1}"
+                text="⬅️ Назад",
+                callback_data=ScoreTeamPage(
+                    event_id=event_id, page=page - 1, direction="p", cursor=teams_page.first_key
+                ).pack(),
             )
         )
-    if page < total_pages:
+    if teams_page.has_next:
         nav_buttons.append(
             InlineKeyboardButton(
-                text="➡️ Далее", callback_data=f"score_team_page:{page + 1}"
+                text="➡️ Далее",
+                callback_data=ScoreTeamPage(
+                    event_id=event_id, page=page + 1, direction="n", cursor=teams_page.last_key
+                ).pack(),
             )
         )
     if nav_buttons:
@@ -67,136 +86,178 @@ def get_score_teams_kb(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-@router.callback_query(lambda c: c.data == "score_start")
-async def handle_score_start(callback: CallbackQuery, state: FSMContext):
+def get_categories_kb(team_id: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text=title, callback_data=ScoreCategory(team_id=team_id, key=key).pack())]
+            for key, (title, points, count_type) in CATEGORIES.items()
+        ]
+        + [[InlineKeyboardButton(text="🚫 Завершить", callback_data="score_stop")]]
+    )
+
+
+def get_confirm_kb(team_id: int, key: str, points: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text="✅ Подтвердить",
+                    callback_data=ScoreConfirm(team_id=team_id, key=key, points=points).pack(),
+                ),
+                InlineKeyboardButton(
+                    text="🚫 Отклонить", callback_data=ScoreBack(team_id=team_id).pack()
+                ),
+            ]
+        ]
+    )
+
+
+def get_quantity_kb(team_id: int, key: str, count: int) -> InlineKeyboardMarkup:
+    """Цифровая клавиатура: каждая кнопка несёт уже набранное число."""
+
+    def digit(d: int) -> InlineKeyboardButton:
+        typed = count * 10 + d
+        return InlineKeyboardButton(
+            text=str(d),
+            callback_data=ScoreQty(team_id=team_id, key=key, count=typed if typed <= MAX_BAGS else count).pack(),
+        )
+
+    # Ничего не набрано — «Готово» начисляет один мешок, как раньше
+    bags = max(count, 1)
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [digit(1), digit(2), digit(3)],
+            [digit(4), digit(5), digit(6)],
+            [digit(7), digit(8), digit(9)],
+            [
+                InlineKeyboardButton(
+                    text="⌫", callback_data=ScoreQty(team_id=team_id, key=key, count=count // 10).pack()
+                ),
+                digit(0),
+                InlineKeyboardButton(
+                    text=f"✅ {bags} шт.", callback_data=ScoreBags(team_id=team_id, key=key, count=bags).pack()
+                ),
+            ],
+            [InlineKeyboardButton(text="↩️ Назад", callback_data=ScoreBack(team_id=team_id).pack())],
+        ]
+    )
+
+
+def quantity_text(key: str, count: int) -> str:
+    title, points, count_type = CATEGORIES[key]
+    bags = max(count, 1)
+    return (
+        f"Сколько мешков: <b>{title}</b>?\n"
+        f"Набрано: <b>{count}</b> — будет начислено <b>{bags * points}</b> баллов за {bags} шт."
+    )
+
+
+def is_bag_category(key: str) -> bool:
+    """Категории «fixed»: баллы за единицу, начисляются количеством."""
+    return key in CATEGORIES and CATEGORIES[key][2] == "fixed"
+
+
+def is_allowed_points(key: str, points: int) -> bool:
+    """Баллы из кнопки должны совпадать с тем, что допускает категория."""
+    if key not in CATEGORIES:
+        return False
+    allowed = CATEGORIES[key][1]
+    return points in allowed if isinstance(allowed, list) else points == allowed
+
+
+@callbacks("score_start")
+async def handle_score_start(callback: CallbackQuery, state: FSMContext, uow: UnitOfWork):
     await callback.answer()
     await score_start(
-        callback.message, state
+        callback.message, state, uow
     )  # 👈 вызываем существующий хендлер команд
 
 
 @router.message(Command("score"))
-async def score_start(message: Message, state: FSMContext):
-    async with async_session() as session:
-        stmt = select(Event).order_by(Event.created_at.desc())
-        result = await session.execute(stmt)
-        events = result.scalars().all()
+async def score_start(message: Message, state: FSMContext, uow: UnitOfWork):
+    kb = await event_picker.keyboard(uow.read)
 
-    if not events:
+    if kb is None:
         await message.answer("❗ Пока нет ни одного субботника.")
         return
 
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text=event.title, callback_data=f"score_event:{event.id}"
-                )
-            ]
-            for event in events
-        ]
-    )
     await message.answer("Выберите субботник для начисления баллов:", reply_markup=kb)
+    # Дальше всё нужное едет в кнопках; состояние лишь сбрасывает ввод других сценариев
     await state.set_state(ScoreStates.waiting_for_event)
 
 
-@router.callback_query(
-    StateFilter(ScoreStates.waiting_for_event),
-    lambda c: c.data.startswith("score_event:"),
-)
-async def select_event(callback: CallbackQuery, state: FSMContext):
+@callbacks(ScoreEvent)
+async def select_event(callback: CallbackQuery, callback_data: ScoreEvent, uow: UnitOfWork):
     await callback.answer()
-    event_id = int(callback.data.split(":")[1])
-    await state.update_data(event_id=event_id, page=1)  # сохраняем текущую страницу
+    event_id = callback_data.event_id
 
-    async with async_session() as session:
-        stmt = select(Team).where(Team.event_id == event_id).order_by(Team.id)
-        result = await session.execute(stmt)
-        teams = result.scalars().all()
+    teams_page = await get_event_teams_page(uow.read, event_id, per_page=ITEMS_PER_PAGE)
 
-    if not teams:
-        await callback.message.answer("❗ В этом субботнике пока нет команд.")
-        await state.clear()
+    if not teams_page.items:
+        await callback.message.answer("❗ В этом субботнике пока нет команд.")  # type: ignore
         return
 
-    total_pages = (len(teams) + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
-    kb = get_score_teams_kb(teams, page=1, total_pages=total_pages)
+    kb = get_score_teams_kb(teams_page, event_id)
 
-    await callback.message.answer(
+    await callback.message.answer(  # type: ignore
         "Выберите команду для начисления баллов:", reply_markup=kb
     )
-    await state.set_state(ScoreStates.waiting_for_team)
-    await state.update_data(
-        teams_list=[team.id for team in teams], total_pages=total_pages
-    )
 
 
-@router.callback_query(
-    StateFilter(ScoreStates.waiting_for_team),
-    lambda c: c.data.startswith("score_team_page:"),
-)
-async def change_team_page(callback: CallbackQuery, state: FSMContext):
+@callbacks(ScoreTeamPage)
+async def change_team_page(callback: CallbackQuery, callback_data: ScoreTeamPage, uow: UnitOfWork):
     await callback.answer()
-    page = int(callback.data.split(":")[1])
-    data = await state.get_data()
-    teams_ids = data.get("teams_list", [])
-    total_pages = data.get("total_pages", 1)
 
-    async with async_session() as session:
-        stmt = select(Team).where(Team.id.in_(teams_ids)).order_by(Team.id)
-        result = await session.execute(stmt)
-        teams = result.scalars().all()
+    cursor_kwargs = {"after_id" if callback_data.direction == "n" else "before_id": callback_data.cursor}
+    teams_page = await get_event_teams_page(
+        uow.read, callback_data.event_id, page=callback_data.page, per_page=ITEMS_PER_PAGE, **cursor_kwargs
+    )
 
-    kb = get_score_teams_kb(teams, page=page, total_pages=total_pages)
-    await state.update_data(page=page)
+    kb = get_score_teams_kb(teams_page, callback_data.event_id)
 
     try:
-        await callback.message.edit_reply_markup(reply_markup=kb)
+        await callback.message.edit_reply_markup(reply_markup=kb)  # type: ignore
     except:
-        await callback.message.answer("Выберите команду:", reply_markup=kb)
+        await callback.message.answer("Выберите команду:", reply_markup=kb)  # type: ignore
 
 
-@router.callback_query(
-    StateFilter(ScoreStates.waiting_for_team),
-    lambda c: c.data.startswith("score_team:"),
-)
-async def select_team(callback: CallbackQuery, state: FSMContext):
+@callbacks(ScoreTeam)
+@callbacks(ScoreBack)
+async def select_team(callback: CallbackQuery, callback_data: ScoreTeam | ScoreBack, uow: UnitOfWork):
+    """Выбор команды, а также «Отклонить» и «Назад» — снова меню категорий."""
     await callback.answer()
-    team_id = int(callback.data.split(":")[1])  # type: ignore
-    await state.update_data(team_id=team_id)
 
-    # Получаем название команды
-    async with async_session() as session:
-        stmt = select(Team).where(Team.id == team_id)
-        result = await session.execute(stmt)
-        team = result.scalar_one_or_none()
+    # Название команды — из кэша сущностей
+    team = await get_team(callback_data.team_id, uow.read)
+    if team is None:
+        await callback.message.answer("⚠️ Команда не найдена.")  # type: ignore
+        return
 
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text=title, callback_data=f"score_cat:{key}")]
-            for key, (title, points, count_type) in CATEGORIES.items()
-        ]
-        + [[InlineKeyboardButton(text="🚫 Завершить", callback_data="score_stop")]]
-    )
+    text = f"Выберите категорию для начисления баллов команде <b>{team.name}</b>:"
+    kb = get_categories_kb(team.id)
 
-    await callback.message.answer(  # type: ignore
-        f"Выберите категорию для начисления баллов команде <b>{team.name}</b>:",  # type: ignore
-        parse_mode="HTML",
-        reply_markup=kb,
-    )
+    if isinstance(callback_data, ScoreBack):
+        # Заменяем сообщение с кнопками подтверждения, чтобы их нельзя было нажать позже
+        try:
+            await callback.message.edit_text(text, parse_mode="HTML", reply_markup=kb)  # type: ignore
+            return
+        except:
+            pass
+
+    await callback.message.answer(text, parse_mode="HTML", reply_markup=kb)  # type: ignore
 
 
-@router.callback_query(lambda c: c.data.startswith("score_cat:"))
-async def apply_score(callback: CallbackQuery, state: FSMContext):
+@callbacks(ScoreCategory)
+async def apply_score(callback: CallbackQuery, callback_data: ScoreCategory):
     await callback.answer()
-    cat_key = callback.data.split(":")[1]  # type: ignore
+    cat_key = callback_data.key
+    team_id = callback_data.team_id
 
     if cat_key not in CATEGORIES:
         await callback.message.answer("❌ Неизвестная категория.")  # type: ignore
         return
 
     cat_title, points, count_type = CATEGORIES[cat_key]
-    await state.update_data(category=cat_key)
 
     if isinstance(points, list):
         # Категория с ручным выбором баллов
@@ -204,12 +265,15 @@ async def apply_score(callback: CallbackQuery, state: FSMContext):
         kb = InlineKeyboardMarkup(
             inline_keyboard=[
                 [
-                    InlineKeyboardButton(text=str(p), callback_data=f"score_points:{p}")
+                    InlineKeyboardButton(
+                        text=str(p),
+                        callback_data=ScorePoints(team_id=team_id, key=cat_key, points=p).pack(),
+                    )
                     for p in points[i : i + 3]
                 ]
                 for i in range(0, len(points), 3)
             ]
-            + [[InlineKeyboardButton(text="↩️ Назад", callback_data="score_cancel")]]
+            + [[InlineKeyboardButton(text="↩️ Назад", callback_data=ScoreBack(team_id=team_id).pack())]]
         )
 
         await callback.message.answer(  # type: ignore
@@ -217,90 +281,53 @@ async def apply_score(callback: CallbackQuery, state: FSMContext):
             parse_mode="HTML",
             reply_markup=kb,
         )
-        await state.set_state(ScoreStates.waiting_for_custom_points)
         return
 
-    # Фиксированная категория (int)
-    await state.update_data(points=points)
-
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text="✅ Подтвердить", callback_data="score_confirm"
-                ),
-                InlineKeyboardButton(text="🚫 Отклонить", callback_data="score_reject"),
-            ]
-        ]
-    )
+    # Фиксированная категория: сразу количество, N мешков — одна запись
     await callback.message.answer(  # type: ignore
-        f"Начислить <b>{points}</b> баллов по категории <b>{cat_title}</b>?",
+        quantity_text(cat_key, 0),
         parse_mode="HTML",
-        reply_markup=kb,
+        reply_markup=get_quantity_kb(team_id, cat_key, 0),
     )
-    await state.set_state(ScoreStates.confirming_score)
 
 
-@router.callback_query(
-    StateFilter(ScoreStates.waiting_for_custom_points),
-    lambda c: c.data.startswith("score_points:"),
-)
-async def handle_custom_points(callback: CallbackQuery, state: FSMContext):
+@callbacks(ScoreQty)
+async def type_quantity(callback: CallbackQuery, callback_data: ScoreQty):
     await callback.answer()
-    points = int(callback.data.split(":")[1])  # type: ignore
-    data = await state.get_data()
-    cat_key = data.get("category")
-    cat_title = CATEGORIES[cat_key][0]  # type: ignore
+    count = callback_data.count
 
-    await state.update_data(points=points)
+    if not is_bag_category(callback_data.key) or not 0 <= count <= MAX_BAGS:
+        await callback.message.answer("❌ Неизвестная категория.")  # type: ignore
+        return
 
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text="✅ Подтвердить", callback_data="score_confirm"
-                ),
-                InlineKeyboardButton(text="🚫 Отклонить", callback_data="score_reject"),
-            ]
-        ]
-    )
-    await callback.message.answer(  # type: ignore
-        f"Начислить <b>{points}</b> баллов по категории <b>{cat_title}</b>?",
-        parse_mode="HTML",
-        reply_markup=kb,
-    )
-    await state.set_state(ScoreStates.confirming_score)
+    try:
+        await callback.message.edit_text(  # type: ignore
+            quantity_text(callback_data.key, count),
+            parse_mode="HTML",
+            reply_markup=get_quantity_kb(callback_data.team_id, callback_data.key, count),
+        )
+    except:
+        pass  # число не изменилось (⌫ на нуле, лишняя цифра) — сообщение то же
 
 
-@router.callback_query(lambda c: c.data == "score_cancel")
-async def handle_score_cancel(callback: CallbackQuery, state: FSMContext):
+@callbacks(ScorePoints)
+async def handle_custom_points(callback: CallbackQuery, callback_data: ScorePoints):
     await callback.answer()
+    points = callback_data.points
+    cat_key = callback_data.key
 
-    data = await state.get_data()
-    team_id = data.get("team_id")
-
-    async with async_session() as session:
-        stmt = select(Team).where(Team.id == team_id)
-        result = await session.execute(stmt)
-        team = result.scalar_one_or_none()
-
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text=title, callback_data=f"score_cat:{key}")]
-            for key, (title, points, count_type) in CATEGORIES.items()
-        ]
-        + [[InlineKeyboardButton(text="🛑 Завершить", callback_data="score_stop")]]
-    )
+    if not is_allowed_points(cat_key, points):
+        await callback.message.answer("❌ Неизвестная категория.")  # type: ignore
+        return
 
     await callback.message.answer(  # type: ignore
-        f"Выберите категорию для начисления баллов команде <b>{team.name}</b>:",  # type: ignore
+        f"Начислить <b>{points}</b> баллов по категории <b>{CATEGORIES[cat_key][0]}</b>?",
         parse_mode="HTML",
-        reply_markup=kb,
+        reply_markup=get_confirm_kb(callback_data.team_id, cat_key, points),
     )
-    await state.set_state(ScoreStates.waiting_for_team)
 
 
-@router.callback_query(lambda c: c.data == "score_stop")
+@callbacks("score_stop")
 async def handle_score_stop(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
     await state.clear()
@@ -316,84 +343,76 @@ async def handle_score_stop(callback: CallbackQuery, state: FSMContext):
     )
 
 
-@router.callback_query(
-    StateFilter(ScoreStates.confirming_score), lambda c: c.data == "score_confirm"
-)
-async def confirm_score(callback: CallbackQuery, state: FSMContext):
+@callbacks(ScoreBags)
+async def confirm_bags(callback: CallbackQuery, callback_data: ScoreBags, uow: UnitOfWork):
+    """N мешков — одна строка scores и одна запись в очереди."""
     await callback.answer()
-    data = await state.get_data()
-    team_id = data.get("team_id")
-    category = data.get("category")
-    points = data.get("points")
+    team_id = callback_data.team_id
+    category = callback_data.key
+    count = callback_data.count
 
-    if not team_id or not category:
+    if not is_bag_category(category) or not 1 <= count <= MAX_BAGS:
         await callback.message.answer("⚠️ Ошибка: не хватает данных.")  # type: ignore
-        await state.clear()
         return
 
-    async with async_session() as session:
-        stmt = select(Score).where(Score.team_id == team_id, Score.category == category)
-        result = await session.execute(stmt)
-        score = result.scalar_one_or_none()
+    team = await get_team(team_id, uow.read)
+    if team is None:
+        await callback.message.answer("⚠️ Команда не найдена.")  # type: ignore
+        return
 
-        score = Score(team_id=team_id, category=category, points=points)
-        session.add(score)
+    points = CATEGORIES[category][1] * count
+    await score_writer.add_score(team_id, category, points, count=count)
+    bump_event_version(team.event_id)
 
-        stmt_team = select(Team).where(Team.id == team_id)
-        result_team = await session.execute(stmt_team)
-        team = result_team.scalar_one_or_none()
+    app_logger.info(
+        f"🎯 Начислены баллы: {points} ({count} шт.) | Категория: '{category}' → Команда: '{team.name}' | Субботник ID: {team.event_id}"
+    )
 
-        await session.commit()
+    await show_scored(
+        callback,
+        team_id,
+        f"✅ Баллы начислены: <b>{points}</b> за {count} шт. по категории <b>{CATEGORIES[category][0]}</b>.",
+    )
 
-        app_logger.info(
-            f"🎯 Начислены баллы: {points} | Категория: '{category}' → Команда: '{team.name}' | Субботник ID: {team.event_id}"
-        )  # type: ignore
 
-        await callback.message.answer(  # type: ignore
-            f"✅ Баллы начислены: <b>{points}</b> по категории <b>{CATEGORIES[category][0]}</b>.",
-            parse_mode="HTML",
-        )
-
-        # Показываем меню категорий снова
-        kb = InlineKeyboardMarkup(
-            inline_keyboard=[
-                [InlineKeyboardButton(text=title, callback_data=f"score_cat:{key}")]
-                for key, (title, points, count_type) in CATEGORIES.items()
-            ]
-            + [[InlineKeyboardButton(text="🚫 Завершить", callback_data="score_stop")]]
-        )
+@callbacks(ScoreConfirm)
+async def confirm_score(callback: CallbackQuery, callback_data: ScoreConfirm, uow: UnitOfWork):
+    """Всё для начисления — в callback_data, к хранилищу FSM не обращаемся."""
+    await callback.answer()
+    team_id = callback_data.team_id
+    category = callback_data.key
+    points = callback_data.points
 
-        await callback.message.answer(
-            "Выберите следующую категорию для начисления баллов:", reply_markup=kb
-        )  # type: ignore
-        await state.set_state(ScoreStates.waiting_for_team)
+    if not is_allowed_points(category, points):
+        await callback.message.answer("⚠️ Ошибка: не хватает данных.")  # type: ignore
+        return
 
+    team = await get_team(team_id, uow.read)
+    if team is None:
+        await callback.message.answer("⚠️ Команда не найдена.")  # type: ignore
+        return
 
-@router.callback_query(
-    StateFilter(ScoreStates.confirming_score), lambda c: c.data == "score_reject"
-)
-async def reject_score(callback: CallbackQuery, state: FSMContext):
-    await callback.answer()
-    data = await state.get_data()
-    team_id = data.get("team_id")
+    # Запись идёт через общую очередь с групповыми коммитами
+    await score_writer.add_score(team_id, category, points)
+    bump_event_version(team.event_id)
 
-    async with async_session() as session:
-        stmt = select(Team).where(Team.id == team_id)
-        result = await session.execute(stmt)
-        team = result.scalar_one_or_none()
+    app_logger.info(
+        f"🎯 Начислены баллы: {points} | Категория: '{category}' → Команда: '{team.name}' | Субботник ID: {team.event_id}"
+    )
 
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text=title, callback_data=f"score_cat:{key}")]
-            for key, (title, points, count_type) in CATEGORIES.items()
-        ]
-        + [[InlineKeyboardButton(text="🚫 Завершить", callback_data="score_stop")]]
+    await show_scored(
+        callback, team_id, f"✅ Баллы начислены: <b>{points}</b> по категории <b>{CATEGORIES[category][0]}</b>."
     )
 
+
+async def show_scored(callback: CallbackQuery, team_id: int, text: str):
+    # Кнопки подтверждения убираем вместе с текстом — повторно нажать их нельзя
+    try:
+        await callback.message.edit_text(text, parse_mode="HTML")  # type: ignore
+    except:
+        await callback.message.answer(text, parse_mode="HTML")  # type: ignore
+
+    # Показываем меню категорий снова
     await callback.message.answer(  # type: ignore
-        f"Выберите категорию для начисления баллов команде <b>{team.name}</b>:",  # type: ignore
-        parse_mode="HTML",
-        reply_markup=kb,
+        "Выберите следующую категорию для начисления баллов:", reply_markup=get_categories_kb(team_id)
     )
-
-    await state.set_state(ScoreStates.waiting_for_team)
@@ -7,63 +7,60 @@ from aiogram.types import (
     InlineKeyboardMarkup,
     Message,
 )
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Select, select
 
-from database.db import async_session
-from database.models import Event, Score, Team
+from database.models import Team
+from database.score_writer import score_writer
+from database.totals import team_balances_stmt
+from handlers.event_picker import EventPicker
+from handlers.routing import callbacks
 from logger import app_logger
+from middlewares.db_session import UnitOfWork
 from states.score_manage import ScoreManageStates
+from utils.cache import bump_event_version
+from utils.callback_data import AdjustDelete, AdjustEvent, AdjustTeam
 from utils.constants import CATEGORIES
+from utils.entities import get_team
 from utils.keyboards import back_button, back_menu_button
 
-router = Router()
+router = Router(name="score_manage")
+
+event_picker = EventPicker(AdjustEvent)
 
 
 @router.message(Command("adjust_score"))
-async def adjust_score_start(message: Message, state: FSMContext):
-    async with async_session() as session:
-        result = await session.execute(select(Event).order_by(Event.created_at.desc()))
-        events = result.scalars().all()
+async def adjust_score_start(message: Message, state: FSMContext, uow: UnitOfWork):
+    kb = await event_picker.keyboard(uow.read)
 
-    if not events:
+    if kb is None:
         await message.answer("❗ Субботники пока не созданы.")
         return
 
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text=event.title, callback_data=f"adjust_event:{event.id}"
-                )
-            ]
-            for event in events
-        ]
-    )
     await message.answer("Выберите субботник:", reply_markup=kb)
     await state.set_state(ScoreManageStates.waiting_for_event)
 
 
-@router.callback_query(lambda c: c.data == "adjust_score_start")
-async def handle_adjust_button(callback: CallbackQuery, state: FSMContext):
+@callbacks("adjust_score_start")
+async def handle_adjust_button(callback: CallbackQuery, state: FSMContext, uow: UnitOfWork):
     await callback.answer()
-    await adjust_score_start(callback.message, state)
+    await adjust_score_start(callback.message, state, uow)
 
 
-@router.callback_query(
-    StateFilter(ScoreManageStates.waiting_for_event),
-    lambda c: c.data.startswith("adjust_event:"),
-)
-async def adjust_select_event(callback: CallbackQuery, state: FSMContext):
+def adjust_teams_stmt(event_id: int) -> Select:
+    """Команды субботника по алфавиту — список для выбора команды."""
+    return select(Team).where(Team.event_id == event_id).order_by(Team.name)
+
+
+@callbacks(AdjustEvent, ScoreManageStates.waiting_for_event)
+async def adjust_select_event(
+    callback: CallbackQuery, callback_data: AdjustEvent, state: FSMContext, uow: UnitOfWork
+):
     await callback.answer()
-    event_id = int(callback.data.split(":")[1])  # type: ignore
+    event_id = callback_data.event_id
     await state.update_data(event_id=event_id)
 
-    async with async_session() as session:
-        stmt = select(Team).where(Team.event_id == event_id).order_by(Team.name)
-        result = await session.execute(stmt)
-
-        teams = result.scalars().all()
+    result = await uow.read.execute(adjust_teams_stmt(event_id))
+    teams = result.scalars().all()
 
     if not teams:
         await callback.message.answer("❗ В этом субботнике нет команд.")  # type: ignore
@@ -74,7 +71,7 @@ async def adjust_select_event(callback: CallbackQuery, state: FSMContext):
         inline_keyboard=[
             [
                 InlineKeyboardButton(
-                    text=team.name, callback_data=f"adjust_team:{team.id}"
+                    text=team.name, callback_data=AdjustTeam(team_id=team.id).pack()
                 )
             ]
             for team in teams
@@ -84,26 +81,19 @@ async def adjust_select_event(callback: CallbackQuery, state: FSMContext):
     await state.set_state(ScoreManageStates.waiting_for_team)
 
 
-@router.callback_query(
-    StateFilter(ScoreManageStates.waiting_for_team),
-    lambda c: c.data.startswith("adjust_team:"),
-)
-async def adjust_select_team(callback: CallbackQuery, state: FSMContext):
+@callbacks(AdjustTeam, ScoreManageStates.waiting_for_team)
+async def adjust_select_team(
+    callback: CallbackQuery, callback_data: AdjustTeam, state: FSMContext, uow: UnitOfWork
+):
     await callback.answer()
-    team_id = int(callback.data.split(":")[1])  # type: ignore
-    await state.update_data(team_id=team_id)
-    await render_team_scores(callback.message, state)  # type: ignore
+    await state.update_data(team_id=callback_data.team_id)
+    await render_team_scores(callback.message, state, uow)  # type: ignore
 
 
-@router.callback_query(
-    StateFilter(ScoreManageStates.confirming_delete),
-    lambda c: c.data.startswith("adjust_delete:"),
-)
-async def delete_category_score(callback: CallbackQuery, state: FSMContext):
+@callbacks(AdjustDelete, ScoreManageStates.confirming_delete)
+async def delete_category_score(callback: CallbackQuery, callback_data: AdjustDelete, state: FSMContext):
     await callback.answer()
-    data = await state.get_data()
-    team_id = data.get("team_id")
-    cat_key = callback.data.split(":")[1]  # type: ignore
+    cat_key = callback_data.category
 
     await state.update_data(category_to_adjust=cat_key)
     await callback.message.answer(  # type: ignore
@@ -114,9 +104,10 @@ async def delete_category_score(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(StateFilter(ScoreManageStates.waiting_for_amount_to_subtract))
-async def subtract_points(message: Message, state: FSMContext):
+async def subtract_points(message: Message, state: FSMContext, uow: UnitOfWork):
     data = await state.get_data()
     team_id = data.get("team_id")
+    event_id = data.get("event_id")
     category = data.get("category_to_adjust")
 
     try:
@@ -127,36 +118,29 @@ async def subtract_points(message: Message, state: FSMContext):
         await message.answer("❗ Введите положительное число.")
         return
 
-    async with async_session() as session:
-        stmt = select(Score).where(Score.team_id == team_id, Score.category == category)
-        result = await session.execute(stmt)
-        score = result.scalar_one_or_none()
-
-        if not score:
-            await message.answer("⚠️ Баллы по этой категории не найдены.")
-            await state.clear()
-            return
+    # Запись идёт через общую очередь с групповыми коммитами
+    subtracted = await score_writer.subtract_score(team_id, category, amount)  # type: ignore
 
-        score.points -= amount
-        if score.points <= 0:
-            session.delete(score)  # type: ignore
-        await session.commit()
+    if subtracted is None:
+        await message.answer("⚠️ Баллы по этой категории не найдены.")
+        await state.clear()
+        return
 
-        app_logger.info(
-            f"🔻 Вычтено {amount} баллов из '{category}' команды ID {team_id}"
-        )
+    bump_event_version(event_id)  # type: ignore
+    capped = subtracted < amount
+    app_logger.info(
+        f"🔻 Вычтено {subtracted} баллов из '{category}' команды ID {team_id}"
+        + (f" (запрошено {amount}, больше баланса)" if capped else "")
+    )
 
-    await message.answer(
-        f"✅ Вычтено <b>{amount}</b> баллов из категории <b>{CATEGORIES[category][0]}</b>.",
-        parse_mode="HTML",
-    )  # type: ignore
-    await render_team_scores(message, state)
+    text = f"✅ Вычтено <b>{subtracted}</b> баллов из категории <b>{CATEGORIES[category][0]}</b>."
+    if capped:
+        text += f"\nЗапрошено {amount}, но на балансе было только {subtracted} — категория обнулена."
+    await message.answer(text, parse_mode="HTML")  # type: ignore
+    await render_team_scores(message, state, uow)
 
 
-@router.callback_query(
-    StateFilter(ScoreManageStates.confirming_delete),
-    lambda c: c.data == "adjust_cancel",
-)
+@callbacks("adjust_cancel", ScoreManageStates.confirming_delete)
 async def adjust_cancel(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
     await state.clear()
@@ -168,16 +152,16 @@ async def adjust_cancel(callback: CallbackQuery, state: FSMContext):
 
 
 # 🔁 Общая функция отрисовки текущих баллов команды
-async def render_team_scores(target_message: Message, state: FSMContext):
+async def render_team_scores(target_message: Message, state: FSMContext, uow: UnitOfWork):
     data = await state.get_data()
     team_id = data.get("team_id")
 
-    async with async_session() as session:
-        stmt = select(Team).where(Team.id == team_id).options(selectinload(Team.scores))
-        result = await session.execute(stmt)
-        team = result.scalar_one_or_none()
+    # Сессия апдейта открывается здесь, уже после коммита вычитания в score_writer.
+    # По одной строке баланса на категорию, сколько бы начислений ни было
+    team = await get_team(team_id, uow.session)  # type: ignore
+    balances = (await uow.session.execute(team_balances_stmt(team_id))).all()  # type: ignore
 
-    if not team or not team.scores:
+    if not team or not balances:
         await target_message.answer("У этой команды пока нет баллов.")
         await state.clear()
         return
@@ -185,14 +169,14 @@ async def render_team_scores(target_message: Message, state: FSMContext):
     text = f"🔧 Управление баллами — команда <b>{team.name}</b>\n\n"
 
     kb = []
-    for score in team.scores:
-        cat_title = CATEGORIES.get(score.category, (score.category, ""))[0]
-        text += f"{cat_title}: <b>{score.points}</b> баллов\n"
+    for category, points in balances:
+        cat_title = CATEGORIES.get(category, (category, ""))[0]
+        text += f"{cat_title}: <b>{points}</b> баллов\n"
         kb.append(
             [
                 InlineKeyboardButton(
                     text=f"❌ Удалить: {cat_title}",
-                    callback_data=f"adjust_delete:{score.category}",
+                    callback_data=AdjustDelete(category=category).pack(),
                 )
             ]
         )
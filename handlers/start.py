@@ -1,56 +1,49 @@
-import os
-
 from aiogram import Router, types
 from aiogram.exceptions import TelegramForbiddenError
 from aiogram.filters import Command
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from sqlalchemy import select
 
-from database.db import async_session
 from database.models import User
+from handlers.routing import callbacks
 from logger import app_logger
+from middlewares.db_session import UnitOfWork
+from utils.admins import env_admin_ids, is_admin
 from utils.keyboards import back_menu_button, main_menu_kb
 
-router = Router()
+router = Router(name="start")
 
 @router.message(Command('start'))
-async def start_cmd(message: types.Message):
+async def start_cmd(message: types.Message, uow: UnitOfWork):
     user = message.from_user
 
     if user is None:
         await message.answer("Ошибка: не удалось определить пользователя.")
         return
 
-    async with async_session() as session:
-        stmt = select(User).where(User.telegram_id == user.id)
-        result = await session.execute(stmt)
-        db_user = result.scalar_one_or_none()
-
-        admin_ids = [int(i.strip()) for i in os.getenv("ADMIN_IDS", "").split(",") if i.strip().isdigit()]
-        is_admin = user.id in admin_ids
-
-        if db_user is None:
-            db_user = User(
-                telegram_id=user.id,
-                username=user.username,
-                first_name=user.first_name,
-                is_admin=is_admin
-            )
-            session.add(db_user)
-            await session.commit()
-            app_logger.info(f"🆕 Новый пользователь: {user.id} | @{user.username or '-'} | is_admin=False")
-        else:
-            is_admin = bool(db_user.is_admin)
-
-        # Ещё раз: db_user уже точно не None, проверяем is_admin
-        if db_user.is_admin is not True:
-            await message.answer("⛔ У тебя нет прав для использования бота.")
-            app_logger.info(f"⛔ Доступ запрещён обычному пользователю: {user.id} | @{user.username or '-'}")
-            return
+    stmt = select(User).where(User.telegram_id == user.id)
+    result = await uow.session.execute(stmt)
+    db_user = result.scalar_one_or_none()
 
+    if db_user is None:
+        db_user = User(
+            telegram_id=user.id,
+            username=user.username,
+            first_name=user.first_name,
+            is_admin=user.id in env_admin_ids()
+        )
+        uow.session.add(db_user)
+        await uow.commit()
+        app_logger.info(f"🆕 Новый пользователь: {user.id} | @{user.username or '-'} | is_admin={db_user.is_admin}")
+
+    # Права берём из того же кэша, что и AdminMiddleware
+    if not await is_admin(user.id):
+        await message.answer("⛔ У тебя нет прав для использования бота.")
+        app_logger.info(f"⛔ Доступ запрещён обычному пользователю: {user.id} | @{user.username or '-'}")
+        return
 
-        # Только для админа — показываем кнопку
-        kb = main_menu_kb()
+    # Только для админа — показываем кнопку
+    kb = main_menu_kb()
 
     try:
         await message.answer(
@@ -62,7 +55,7 @@ async def start_cmd(message: types.Message):
         app_logger.warning(f"❌ Пользователь {user.id} заблокировал бота.")
 
 
-@router.callback_query(lambda c: c.data == "view_database")
+@callbacks("view_database")
 async def handle_view_database(callback: CallbackQuery):
     await callback.answer()
 
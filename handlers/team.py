@@ -3,42 +3,36 @@ from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.types import (
     CallbackQuery,
-    InlineKeyboardButton,
     InlineKeyboardMarkup,
     Message,
 )
-from sqlalchemy import select
 
-from database.db import async_session
-from database.models import Event, Team
+from database.models import Team
+from handlers.event_picker import EventPicker
+from handlers.routing import callbacks
 from logger import app_logger
+from middlewares.db_session import UnitOfWork
 from states.team import TeamStates
+from utils.cache import bump_event_version, teams_view_cache
+from utils.callback_data import TeamEvent
+from utils.entities import get_event, invalidate_team
 from utils.keyboards import add_more, back_button, back_menu_button
 
-router = Router()
+router = Router(name="team")
+
+event_picker = EventPicker(TeamEvent, back="back_to_main")
 
 # 🔘 Команда: /add_team
 @router.message(Command("add_team"))
-async def add_team_command(message: Message, state: FSMContext):
-    async with async_session() as session:
-        stmt = select(Event).order_by(Event.created_at.desc())
-        result = await session.execute(stmt)
-        events = result.scalars().all()
-
-    kb2 = InlineKeyboardMarkup(inline_keyboard=[*back_button('back_to_main')])
+async def add_team_command(message: Message, state: FSMContext, uow: UnitOfWork):
+    # 👇 Кнопки с data=event:<id>, постранично
+    kb = await event_picker.keyboard(uow.read)
 
-    if not events:
+    if kb is None:
+        kb2 = InlineKeyboardMarkup(inline_keyboard=[*back_button('back_to_main')])
         await message.answer("⚠️ Пока нет ни одного субботника.", reply_markup=kb2)
         return
 
-    # 👇 Формируем кнопки с data=event:<id>
-    buttons = [
-        *[[InlineKeyboardButton(text=event.title, callback_data=f"event:{event.id}")]
-        for event in events],
-        *back_button('back_to_main')
-    ]
-    kb = InlineKeyboardMarkup(inline_keyboard=buttons)
-
     await message.answer(
         "Выберите субботник, к которому хотите добавить команду:",
         reply_markup=kb
@@ -47,30 +41,24 @@ async def add_team_command(message: Message, state: FSMContext):
 
 
 # 🔁 Callback из кнопки "Добавить команду" в start.py
-@router.callback_query(lambda c: c.data == "add_team")
-async def handle_add_team_callback(callback: CallbackQuery, state: FSMContext):
+@callbacks("add_team")
+async def handle_add_team_callback(callback: CallbackQuery, state: FSMContext, uow: UnitOfWork):
     await callback.answer()
-    await add_team_command(callback.message, state)  # type: ignore
+    await add_team_command(callback.message, state, uow)  # type: ignore
 
 
 # ✅ Обработка выбора субботника (event:<id>)
-@router.callback_query(StateFilter(TeamStates.waiting_for_event_title), lambda c: c.data and c.data.startswith("event:"))
-async def process_event_choice(callback: CallbackQuery, state: FSMContext):
+@callbacks(TeamEvent, TeamStates.waiting_for_event_title)
+async def process_event_choice(callback: CallbackQuery, callback_data: TeamEvent, state: FSMContext):
     await callback.answer()
-    try:
-        event_id = int(callback.data.split(":")[1])  # type: ignore
-    except (IndexError, ValueError):
-        await callback.message.answer("❌ Ошибка: не удалось определить субботник.") # type: ignore
-        return
-
-    await state.update_data(event_id=event_id)
+    await state.update_data(event_id=callback_data.event_id)
     await callback.message.answer("Введите название команды:", reply_markup=InlineKeyboardMarkup(inline_keyboard=[*back_button('add_team')])) # type: ignore
     await state.set_state(TeamStates.waiting_for_team_name)
 
 
 # 📝 Обработка названия команды
 @router.message(StateFilter(TeamStates.waiting_for_team_name))
-async def process_team_name(message: Message, state: FSMContext):
+async def process_team_name(message: Message, state: FSMContext, uow: UnitOfWork):
     if not message.text:
         await message.answer("❗ Название команды не может быть пустым.")
         return
@@ -79,22 +67,22 @@ async def process_team_name(message: Message, state: FSMContext):
     event_id = data.get("event_id")
     team_name = message.text.strip()
 
-    async with async_session() as session:
-        # Получаем название субботника
-        stmt = select(Event).where(Event.id == event_id)
-        result = await session.execute(stmt)
-        event = result.scalar_one_or_none()
-
-        if not event:
-            await message.answer("⚠️ Ошибка: не удалось найти субботник.")
-            await state.clear()
-            return
-
-        # Добавляем команду
-        new_team = Team(name=team_name, event_id=event_id)
-        session.add(new_team)
-        await session.commit()
-        app_logger.info(f"👥 Команда добавлена: '{team_name}' → Субботник: '{event.title}' (ID {event.id})")
+    # Название субботника — из кэша сущностей
+    event = await get_event(event_id, uow.read)  # type: ignore
+
+    if not event:
+        await message.answer("⚠️ Ошибка: не удалось найти субботник.")
+        await state.clear()
+        return
+
+    # Добавляем команду; коммитим сразу — кэши ниже должны видеть новую запись
+    new_team = Team(name=team_name, event_id=event_id)
+    uow.session.add(new_team)
+    await uow.commit()
+    teams_view_cache.clear()
+    invalidate_team(new_team.id)
+    bump_event_version(event_id)  # type: ignore
+    app_logger.info(f"👥 Команда добавлена: '{team_name}' → Субботник: '{event.title}' (ID {event.id})")
 
     kb = InlineKeyboardMarkup(inline_keyboard=[
         *add_more('add_team'),
@@ -1,6 +1,2 @@
-from .events import router as events_router
-from .export_excel import router as export_excel_router
-from .report import router as report_router
-from .teams import router as teams_router
-
-routers = [events_router, teams_router, report_router, export_excel_router]
+# Хендлеры просмотра — только callback'и, они регистрируются в handlers.routing при импорте
+from . import events, export_excel, report, teams  # noqa: F401
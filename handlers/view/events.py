@@ -1,23 +1,26 @@
-from aiogram import Router, types
+from aiogram import types
 from aiogram.types import InlineKeyboardMarkup
-from sqlalchemy import select
+from sqlalchemy import Select, select
 
-from database.db import async_session
 from database.models import Event
+from handlers.routing import callbacks
+from middlewares.db_session import UnitOfWork
 from utils.keyboards import back_button
 
 kb = InlineKeyboardMarkup(inline_keyboard=[*back_button('view_database')])
 
-router = Router()
 
-@router.callback_query(lambda c: c.data == "view_events")
-async def handle_view_events(callback: types.CallbackQuery):
+def events_list_stmt() -> Select:
+    """Все субботники, новые сверху."""
+    return select(Event).order_by(Event.created_at.desc())
+
+
+@callbacks("view_events")
+async def handle_view_events(callback: types.CallbackQuery, uow: UnitOfWork):
     await callback.answer()
 
-    async with async_session() as session:
-        stmt = select(Event).order_by(Event.created_at.desc())
-        result = await session.execute(stmt)
-        events = result.scalars().all()
+    result = await uow.read.execute(events_list_stmt())
+    events = result.scalars().all()
 
     if not events:
         await callback.message.answer("📭 Список субботников пуст.", reply_markup=kb) # type: ignore
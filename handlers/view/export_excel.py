@@ -1,155 +1,123 @@
-import os
+import asyncio
+from io import BytesIO
 
-from aiogram import Router
 from aiogram.types import (
+    BufferedInputFile,
     CallbackQuery,
-    FSInputFile,
-    InlineKeyboardButton,
     InlineKeyboardMarkup,
 )
-from openpyxl import Workbook
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-
-from database.db import async_session
-from database.models import Event, Team
+from database.models import Event
+from database.totals import event_ranking_stmt, get_event_bag_totals
+from handlers.event_picker import EventPicker
+from handlers.routing import callbacks
 from logger import app_logger
+from middlewares.db_session import UnitOfWork
+from utils.cache import event_reports_cache, event_version
+from utils.callback_data import ExportEvent
 from utils.constants import CATEGORIES  # 📦 наш словарь с категориями
 from utils.keyboards import back_button, back_menu_button
 
-router = Router()
+event_picker = EventPicker(ExportEvent, back="view_database")
 
 
 # 📦 Кнопка "Экспорт в Excel"
-@router.callback_query(lambda c: c.data == "export_excel")
-async def handle_export_excel_start(callback: CallbackQuery):
+@callbacks("export_excel")
+async def handle_export_excel_start(callback: CallbackQuery, uow: UnitOfWork):
     await callback.answer()
 
-    async with async_session() as session:
-        stmt = select(Event).order_by(Event.created_at.desc())
-        result = await session.execute(stmt)
-        events = result.scalars().all()
+    kb = await event_picker.keyboard(uow.read)
 
-    if not events:
+    if kb is None:
         await callback.message.edit_text("❗ Субботники не найдены.")  # type: ignore
         return
 
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text=event.title, callback_data=f"export_event:{event.id}"
-                )
-            ]
-            for event in events
-        ]
-        + back_button("view_database")
-    )
-
     await callback.message.edit_text(
         "📁 Выбери субботник для экспорта:", reply_markup=kb
     )  # type: ignore
 
 
 # 📄 Обработка выбора субботника
-@router.callback_query(lambda c: c.data and c.data.startswith("export_event:"))
-async def handle_export_event(callback: CallbackQuery):
+@callbacks(ExportEvent)
+async def handle_export_event(callback: CallbackQuery, callback_data: ExportEvent, uow: UnitOfWork):
     await callback.answer()
-    event_id = int(callback.data.split(":")[1])  # type: ignore
-
-    async with async_session() as session:
-        stmt = (
-            select(Team)
-            .where(Team.event_id == event_id)
-            .options(selectinload(Team.scores))
-        )
-        teams_result = await session.execute(stmt)
-        teams = teams_result.scalars().all()
-
-    if not teams:
-        await callback.message.edit_text("❗ У этого субботника пока нет команд.")  # type: ignore
-        return
-
-    # 📊 Загружаем категории
-    category_keys = list(CATEGORIES.keys())
-    category_titles = {
-        key: title for key, (title, points, count_type) in CATEGORIES.items()
-    }
-
-    # 🧾 Создание Excel
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Отчёт"  # type: ignore
+    event_id = callback_data.event_id
 
-    # 🔠 Заголовки
-    headers = (
-        ["Команда"] + [category_titles[key] for key in category_keys] + ["Всего баллов"]
+    kb = InlineKeyboardMarkup(
+        inline_keyboard=[*back_button("view_database"), *back_menu_button()]
     )
-    ws.append(headers)  # type: ignore
 
-    # Устанавливаем ширину столбцов
-    ws.column_dimensions["A"].width = 80  # type: ignore
-    col_letters = "BCDEFGHIJKLMNOPQRSTUVWXYZ"  # на случай большого количества категорий
-    for idx, key in enumerate(category_keys):
-        ws.column_dimensions[col_letters[idx]].width = 30  # type: ignore
-    ws.column_dimensions[col_letters[len(category_keys)]].width = 18  # type: ignore
+    # ♻️ Данные не менялись — пересылаем уже загруженный файл по file_id
+    cache_key = ("export", event_id, event_version(event_id))
+    file_id = event_reports_cache.get(cache_key)
+    if file_id is not None:
+        await callback.message.answer_document(file_id, reply_markup=kb)  # type: ignore
+        return
 
-    rows = []
+    event = await uow.read.get(Event, event_id)
+    # Уже отсортировано в SQL по общему баллу
+    rows = (await uow.read.execute(event_ranking_stmt(event_id))).all()
+    bag_totals = await get_event_bag_totals(uow.read, event_id)
+    # Снимок больше не нужен — отпускаем соединение до сборки и отправки файла
+    await uow.commit()
 
-    for team in teams:
-        row = [team.name]
-        total = 0
+    if event is None or not rows:
+        await callback.message.edit_text("❗ У этого субботника пока нет команд.")  # type: ignore
+        return
 
-        for key in category_keys:
-            score = next((s.points for s in team.scores if s.category == key), 0)
-            row.append(score)  # type: ignore
-            total += score
+    # 🧾 Файл собираем в отдельном потоке, чтобы не блокировать остальных админов
+    content = await asyncio.to_thread(build_event_workbook, rows, bag_totals)
 
-        row.append(total)  # type: ignore
-        rows.append(row)
+    # 📤 Отправка прямо из памяти, без временного файла на диске
+    filename = f"event_{event_id}_report.xlsx"
+    sent = await callback.message.answer_document(
+        BufferedInputFile(content, filename=filename), reply_markup=kb
+    )  # type: ignore
+    if sent.document:
+        event_reports_cache.set(cache_key, sent.document.file_id)
+    app_logger.info(
+        f"📤 Экспорт Excel: Субботник '{event.title}' (ID {event.id}) — админ {callback.from_user.id} | @{callback.from_user.username or '-'}"
+    )  # type: ignore
 
-    # 🔽 Сортировка по общему баллу (последняя колонка)
-    rows.sort(key=lambda x: x[-1], reverse=True)
 
-    # 📥 Запись в Excel
-    for row in rows:
-        ws.append(row)  # type: ignore
+def build_event_workbook(rows, bag_totals: dict[str, int]) -> bytes:
+    """
+    Собирает xlsx в режиме write_only: строки пишутся потоком и не держатся
+    в памяти как объекты ячеек. rows — строки event_ranking_stmt.
+    """
+    from openpyxl import Workbook  # ~70 мс импорта: грузим при первой выгрузке, а не на старте
 
-    ws.append([])  # type: ignore
+    category_keys = list(CATEGORIES.keys())
+    category_titles = {
+        key: title for key, (title, points, count_type) in CATEGORIES.items()
+    }
 
-    # 🧮 Подсчёт мешков по категориям (для всего субботника)
-    category_totals = {key: 0 for key in category_keys}
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Отчёт")
 
-    for team in teams:
-        for score in team.scores:
-            if score.category in category_totals:
-                category_totals[score.category] += 1
+    # Ширину столбцов в write_only нужно задать до первой строки
+    ws.column_dimensions["A"].width = 80
+    col_letters = "BCDEFGHIJKLMNOPQRSTUVWXYZ"  # на случай большого количества категорий
+    for idx, key in enumerate(category_keys):
+        ws.column_dimensions[col_letters[idx]].width = 30
+    ws.column_dimensions[col_letters[len(category_keys)]].width = 18
 
-    # 📦 Добавим итоги по категориям только один раз
-    ws.append([])  # пустая строка перед итогами # type: ignore
-    ws.append(["ИТОГО по категориям (мешки):"])  # type: ignore
-    for key in category_keys:
-        cat_title = category_titles[key]
-        total_bags = category_totals[key]
-        ws.append([f"{cat_title}", total_bags])  # type: ignore
+    # 🔠 Заголовки
+    ws.append(
+        ["Команда"] + [category_titles[key] for key in category_keys] + ["Всего баллов"]
+    )
 
-    filename = f"event_{event_id}_report.xlsx"
-    wb.save(filename)
+    # 📥 Строки команд: position, rank, id, name, total, entries, *баллы по категориям
+    for position, rank, team_id, name, total, entries, *category_points in rows:
+        ws.append([name, *category_points, total])
 
-    event_id = int(callback.data.split(":")[1])  # type: ignore
-    stmt = select(Event).where(Event.id == event_id)
-    result = await session.execute(stmt)
-    event = result.scalar_one_or_none()
+    ws.append([])
 
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[*back_button("view_database"), *back_menu_button()]
-    )
+    # 📦 Итоги по категориям (мешки) — сумма scores.count, посчитана в SQL
+    ws.append([])  # пустая строка перед итогами
+    ws.append(["ИТОГО по категориям (мешки):"])
+    for key in category_keys:
+        ws.append([category_titles[key], bag_totals.get(key, 0)])
 
-    # 📤 Отправка
-    await callback.message.answer_document(
-        FSInputFile(path=filename, filename=filename), reply_markup=kb
-    )  # type: ignore
-    app_logger.info(
-        f"📤 Экспорт Excel: Субботник '{event.title}' (ID {event.id}) — админ {callback.from_user.id} | @{callback.from_user.username or '-'}"
-    )  # type: ignore
-    os.remove(filename)
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
@@ -1,58 +1,45 @@
-from aiogram import Router
-from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-
-from database.db import async_session
-from database.models import Event, Team
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup
+
+from database.totals import get_event_ranking
+from handlers.event_picker import EventPicker
+from handlers.routing import callbacks
+from middlewares.db_session import UnitOfWork
+from utils.cache import event_reports_cache, event_version
+from utils.callback_data import ReportEvent
 from utils.constants import CATEGORIES
 from utils.keyboards import back_button
 
-router = Router()
+event_picker = EventPicker(ReportEvent, back="back_to_main")
 
 
-@router.callback_query(lambda c: c.data == "view_report")
-async def handle_report_start(callback: CallbackQuery):
+@callbacks("view_report")
+async def handle_report_start(callback: CallbackQuery, uow: UnitOfWork):
     await callback.answer()
 
-    async with async_session() as session:
-        stmt = select(Event).order_by(Event.created_at.desc())
-        result = await session.execute(stmt)
-        events = result.scalars().all()
+    kb = await event_picker.keyboard(uow.read)
 
-    if not events:
+    if kb is None:
         await callback.message.answer("❗ Нет доступных субботников.")  # type: ignore
         return
 
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            *[
-                [
-                    InlineKeyboardButton(
-                        text=event.title, callback_data=f"report_event:{event.id}"
-                    )
-                ]
-                for event in events
-            ],
-            *back_button("back_to_main"),
-        ]
-    )
     await callback.message.answer("Выберите субботник для отчёта:", reply_markup=kb)  # type: ignore
 
 
-@router.callback_query(lambda c: c.data.startswith("report_event:"))
-async def handle_report_data(callback: CallbackQuery):
+@callbacks(ReportEvent)
+async def handle_report_data(callback: CallbackQuery, callback_data: ReportEvent, uow: UnitOfWork):
     await callback.answer()
-    event_id = int(callback.data.split(":")[1])  # type: ignore
+    event_id = callback_data.event_id
+
+    kb2 = InlineKeyboardMarkup(inline_keyboard=[*back_button("view_database")])
+
+    # Пока в субботнике ничего не менялось, отдаём уже собранный текст
+    cache_key = ("report", event_id, event_version(event_id))
+    text = event_reports_cache.get(cache_key)
+    if text is not None:
+        await callback.message.answer(text, parse_mode="HTML", reply_markup=kb2)  # type: ignore
+        return
 
-    async with async_session() as session:
-        stmt = (
-            select(Team)
-            .where(Team.event_id == event_id)
-            .options(selectinload(Team.scores))
-        )
-        result = await session.execute(stmt)
-        teams = result.scalars().all()
+    teams = await get_event_ranking(uow.read, event_id)
 
     if not teams:
         await callback.message.answer("❗ В этом субботнике пока нет команд.")  # type: ignore
@@ -60,45 +47,19 @@ async def handle_report_data(callback: CallbackQuery):
 
     text = "<b>📊 Итоги субботника:</b>\n\n"
 
-    # Считаем сумму баллов
-    teams_with_totals = [
-        (team, sum(score.points for score in team.scores)) for team in teams
-    ]
-
-    # Сортируем по убыванию баллов
-    teams_with_totals.sort(key=lambda x: x[1], reverse=True)
-
-    # Если несколько команд имеют одинаковые баллы, сортируем их по ID
-    sorted_teams = []
-    i = 0
-    while i < len(teams_with_totals):
-        same_points = [teams_with_totals[i]]
-        j = i + 1
-        while (
-            j < len(teams_with_totals)
-            and teams_with_totals[j][1] == teams_with_totals[i][1]
-        ):
-            same_points.append(teams_with_totals[j])
-            j += 1
-        # Сортировка по id внутри одинаковых баллов
-        same_points.sort(key=lambda x: x[0].id)
-        sorted_teams.extend(same_points)
-        i = j
-
-    # Формируем текст
-    for idx, (team, total) in enumerate(sorted_teams, start=1):
-        text += f"<b>{idx}. {team.name}</b>\n"
-
-        if not team.scores:
+    # Команды уже отсортированы в SQL: по убыванию баллов, при равенстве — по ID
+    for team in teams:
+        text += f"<b>{team.position}. {team.name}</b>\n"
+
+        if not team.entries:
             text += "— Нет начисленных баллов\n\n"
             continue
 
-        for score in team.scores:
-            cat_title = CATEGORIES.get(score.category, (score.category, ""))[0]
-            text += f"{cat_title}: {score.points} баллов\n"
+        for category, points in team.points.items():
+            if points:
+                text += f"{CATEGORIES[category][0]}: {points} баллов\n"
 
-        text += f"<b>Итого: {total} баллов</b>\n\n"
-
-    kb2 = InlineKeyboardMarkup(inline_keyboard=[*back_button("view_database")])
+        text += f"<b>Итого: {team.total} баллов</b>\n\n"
 
+    event_reports_cache.set(cache_key, text)
     await callback.message.answer(text, parse_mode="HTML", reply_markup=kb2)  # type: ignore
@@ -1,18 +1,21 @@
-from aiogram import Router, types
+from aiogram import types
+from aiogram.filters.callback_data import CallbackData
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.db import async_session
-from database.models import Team
+from database.models import Event, Team
+from handlers.routing import callbacks
+from middlewares.db_session import UnitOfWork
+from utils.cache import teams_view_cache
+from utils.callback_data import ViewTeamsPage
 from utils.keyboards import back_button
 
-router = Router()
 ITEMS_PER_PAGE = 20  # Количество команд на одной странице
 
 
 def get_teams_kb(
-    page: int, total_pages: int, callback_base: str = "view_teams"
+    page: int, total_pages: int, page_data: type[CallbackData] = ViewTeamsPage
 ) -> InlineKeyboardMarkup:
     buttons = []
 
@@ -21,13 +24,13 @@ def get_teams_kb(
     if page > 1:
         nav_buttons.append(
             InlineKeyboardButton(
-                text="⬅️ Назад", callback_data=f"{callback_base}:{page - 1}"
+                text="⬅️ Назад", callback_data=page_data(page=page - 1).pack()
             )
         )
     if page < total_pages:
         nav_buttons.append(
             InlineKeyboardButton(
-                text="➡️ Далее", callback_data=f"{callback_base}:{page + 1}"
+                text="➡️ Далее", callback_data=page_data(page=page + 1).pack()
             )
         )
     if nav_buttons:
@@ -39,40 +42,65 @@ def get_teams_kb(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-@router.callback_query(lambda c: c.data.startswith("view_teams"))
-async def handle_view_teams(callback: types.CallbackQuery):
+@callbacks("view_teams")
+@callbacks(ViewTeamsPage)
+async def handle_view_teams(callback: types.CallbackQuery, callback_data: ViewTeamsPage | None, uow: UnitOfWork):
     await callback.answer()
 
-    # Получаем номер страницы из callback_data
-    try:
-        page = int(callback.data.split(":")[1])
-    except (IndexError, ValueError):
-        page = 1
+    # Кнопка из меню приходит без номера страницы
+    page = callback_data.page if callback_data else 1
 
-    async with async_session() as session:
-        stmt = select(Team).options(selectinload(Team.event)).order_by(Team.event_id)
-        result = await session.execute(stmt)
-        teams = result.scalars().all()
+    text, total_pages = await render_teams_page(uow.read, page)
 
-    if not teams:
+    if text is None:
         await callback.message.answer(
-            "📭 Список команд пуст.", reply_markup=back_button("view_database")[0]
+            "📭 Список команд пуст.",
+            reply_markup=InlineKeyboardMarkup(inline_keyboard=back_button("view_database")),
         )  # type: ignore
         return
 
-    total_pages = (len(teams) + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
-    start = (page - 1) * ITEMS_PER_PAGE
-    end = start + ITEMS_PER_PAGE
-    teams_page = teams[start:end]
-
-    text = f"<b>👥 Список команд (страница {page}/{total_pages}):</b>\n\n"
-    for team in teams_page:
-        event_title = team.event.title if team.event else "❓ Неизвестный субботник"
-        text += f"• <b>{team.name}</b> — <i>{event_title}</i>\n"
-
-    kb = get_teams_kb(page, total_pages)
+    kb = get_teams_kb(min(max(page, 1), total_pages), total_pages)  # та же страница, что отрисована
     # Если сообщение уже есть, редактируем, иначе отправляем новое
     try:
         await callback.message.edit_text(text, parse_mode="HTML", reply_markup=kb)
     except:
         await callback.message.answer(text, parse_mode="HTML", reply_markup=kb)
+
+
+async def render_teams_page(session: AsyncSession, page: int) -> tuple[str | None, int]:
+    """
+    Достаём из базы только одну страницу (LIMIT/OFFSET) и только нужные поля,
+    рендерим текст и кладём его в кэш. Номер страницы из callback'а (старая
+    кнопка или подделанный view_teams:99) прижимается к 1..total_pages.
+    """
+    total = teams_view_cache.get("total")
+    if total is None:
+        total = (await session.execute(select(func.count(Team.id)))).scalar_one()
+        teams_view_cache.set("total", total)
+
+    if not total:
+        return None, 0
+
+    total_pages = (total + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
+    page = min(max(page, 1), total_pages)
+
+    cached = teams_view_cache.get(("page", page))
+    if cached is not None:
+        return cached
+
+    stmt = (
+        select(Team.name, Event.title)
+        .outerjoin(Event, Team.event_id == Event.id)
+        .order_by(Team.event_id, Team.id)
+        .limit(ITEMS_PER_PAGE)
+        .offset((page - 1) * ITEMS_PER_PAGE)
+    )
+    rows = (await session.execute(stmt)).all()
+
+    text = f"<b>👥 Список команд (страница {page}/{total_pages}):</b>\n\n"
+    for team_name, event_title in rows:
+        event_title = event_title or "❓ Неизвестный субботник"
+        text += f"• <b>{team_name}</b> — <i>{event_title}</i>\n"
+
+    teams_view_cache.set(("page", page), (text, total_pages))
+    return text, total_pages
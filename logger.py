@@ -1,26 +1,102 @@
+import atexit
+import json
 import logging
 import os
+import queue
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+
+from config import LOG_BACKUP_COUNT, LOG_FORMAT, LOG_LEVEL, LOG_MAX_BYTES, LOG_ROTATE_WHEN
 
 LOG_DIR = "logs"
 LOG_FILE = "bot.log"
 
-# Убедимся, что папка logs существует
-os.makedirs(LOG_DIR, exist_ok=True)
-
 # Формат логов
 log_format = "%(asctime)s [%(levelname)s] [%(name)s] %(message)s"
 date_format = "%Y-%m-%d %H:%M:%S"
 
-# Настройка логгера
-logging.basicConfig(
-    level=logging.INFO,
-    format=log_format,
-    datefmt=date_format,
-    handlers=[
-        logging.FileHandler(f"{LOG_DIR}/{LOG_FILE}", encoding='utf-8'),
-        logging.StreamHandler()  # Также выводит в консоль
-    ]
-)
+# Поля текущего апдейта для JSON-логов: update_id, user_id, handler.
+# Заполняет middlewares.log_context.LogContextMiddleware
+log_context: ContextVar[dict] = ContextVar("log_context", default={})
+CONTEXT_FIELDS = ("update_id", "user_id", "handler")
+
+
+def bind_log_context(**fields) -> None:
+    """Дополняет поля текущего апдейта (действует до конца апдейта)."""
+    log_context.set({**log_context.get(), **fields})
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна строка JSON на запись — для сборщиков логов."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, date_format),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Кладёт запись в очередь как есть: форматирование и запись на диск — в
+    потоке QueueListener. В потоке бота к записи добавляются только поля
+    контекста апдейта, пока ContextVar ещё доступен.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        for field, value in log_context.get().items():
+            setattr(record, field, value)
+        return record
+
+
+def build_handlers(log_dir: str = LOG_DIR, fmt: str = LOG_FORMAT) -> list[logging.Handler]:
+    """Файл с ротацией (по размеру или по времени) и консоль."""
+    os.makedirs(log_dir, exist_ok=True)
+    path = os.path.join(log_dir, LOG_FILE)
+    if LOG_ROTATE_WHEN:
+        file_handler: logging.Handler = TimedRotatingFileHandler(
+            path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    else:
+        file_handler = RotatingFileHandler(
+            path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+
+    formatter = JsonFormatter() if fmt == "json" else logging.Formatter(log_format, date_format)
+    handlers = [file_handler, logging.StreamHandler()]  # Также выводит в консоль
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logging(handlers: list[logging.Handler], level: str | int = LOG_LEVEL) -> QueueListener:
+    """
+    Корневой логгер пишет только в очередь; вывод — в фоновом потоке,
+    так что app_logger.info() в хендлере не ждёт диска и консоли.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(ContextQueueHandler(log_queue))
+    root.setLevel(level)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+listener = setup_logging(build_handlers())
+atexit.register(listener.stop)  # дописываем очередь при выходе
 
 # Отдельные именованные логгеры
 app_logger = logging.getLogger("bot.app")
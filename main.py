@@ -1,39 +1,96 @@
+from startup_profile import startup_profile  # первым: при STARTUP_PROFILE засекает остальные импорты
+
 import asyncio
-import os
 
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
-from dotenv import load_dotenv
 
-from database.db import init_db
-from handlers import add_admin, common, event, score, score_manage, start, team
-from handlers.view import routers as view_routers
+from config import BOT_MODE, BOT_TOKEN, METRICS_ENABLED
+from database.compaction import score_compactor
+from database.db import async_read_session, init_db
+from database.fsm_storage import SQLiteStorage
+from database.score_writer import score_writer
+from handlers import add_admin, common, event, event_picker, score, score_manage, start, team, view  # noqa: F401
+from handlers.routing import callbacks
+from handlers.view.report import event_picker as report_picker
+from handlers.view.teams import render_teams_page
 from logger import app_logger
+from middlewares.auth import AdminMiddleware
+from middlewares.db_session import DbSessionMiddleware
+from middlewares.inline_answer import InlineAnswerMiddleware
+from middlewares.log_context import LogContextMiddleware
+from middlewares.startup_profile import FirstUpdateMiddleware
+from middlewares.throttling import ThrottlingMiddleware
+from utils.admins import load_admins
+from utils.entities import log_entity_cache_stats, warm_entity_cache
 
 app_logger.info("Бот запускается...")
 logger = app_logger
 
-load_dotenv()
-BOT_TOKEN = os.getenv("BOT_TOKEN") or ""
-
 bot = Bot(token=BOT_TOKEN)
-dp = Dispatcher(storage=MemoryStorage())
+dp = Dispatcher(storage=SQLiteStorage())
+if startup_profile.enabled:
+    dp.update.outer_middleware(FirstUpdateMiddleware())  # снаружи всех: полное время первого апдейта
+dp.update.outer_middleware(LogContextMiddleware())  # update_id и user_id в каждой записи лога
+dp.update.outer_middleware(InlineAnswerMiddleware())  # ловит и ответы из AdminMiddleware
+dp.update.outer_middleware(DbSessionMiddleware())  # одна ленивая сессия на апдейт: аргумент uow
+dp.update.outer_middleware(AdminMiddleware())
+dp.callback_query.outer_middleware(ThrottlingMiddleware())
+dp.message.middleware(LogContextMiddleware())  # + имя хендлера
+if METRICS_ENABLED:
+    # Выключенные метрики ничего не стоят: ни middleware, ни наблюдателя запросов, ни импорта aiohttp.web
+    from metrics import enable_sql_metrics
+    from middlewares.metrics import MetricsMiddleware
 
+    dp.message.middleware(MetricsMiddleware())
+    dp.callback_query.middleware(MetricsMiddleware())
+    enable_sql_metrics()
+dp.startup.register(score_compactor.start)  # фоновый перенос старого журнала баллов в архив
+dp.shutdown.register(score_compactor.stop)
+dp.shutdown.register(score_writer.stop)  # дописываем очередь баллов до выхода
+dp.shutdown.register(log_entity_cache_stats)
+
+dp.include_router(callbacks.router)  # все callback'и: разбор data и поиск хендлера по префиксу
 dp.include_router(start.router)
 dp.include_router(add_admin.router)
 dp.include_router(event.router)
 dp.include_router(score.router)
 dp.include_router(team.router)
-dp.include_router(common.router)
 dp.include_router(score_manage.router)
-for router in view_routers:
-    dp.include_router(router)
+startup_profile.mark("импорт и сборка dp")
+
+
+async def warm_up():
+    """
+    Прогрев до приёма апдейтов: соединение пула чтения (PRAGMA профиля
+    выполняются при подключении), скомпилированные запросы первых экранов,
+    страница «Все команды» и кэш последних субботников с их командами.
+    """
+    async with async_read_session() as session:
+        await report_picker.keyboard(session)
+        await render_teams_page(session, 1)
+        await warm_entity_cache(session, events=report_picker.per_page)
 
 
 async def main():
     await init_db()
+    await load_admins()
+    startup_profile.mark("база и админы")
+    await warm_up()
+    startup_profile.mark("прогрев")
     print("Бот запущен ✅")
-    await dp.start_polling(bot)
+    if METRICS_ENABLED:
+        from metrics import start_metrics_server  # /metrics только на METRICS_HOST, не на публичном вебхуке
+
+        await start_metrics_server()
+    if BOT_MODE == "webhook":
+        from webhook import run_webhook  # aiohttp.web нужен только вебхуку
+
+        startup_profile.mark("запуск вебхука")
+        await run_webhook(dp, bot)
+    else:
+        await bot.delete_webhook()  # после режима вебхука getUpdates иначе вернёт конфликт
+        startup_profile.mark("запуск polling")
+        await dp.start_polling(bot)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,194 @@
+"""
+Метрики в текстовом формате Prometheus: задержки хендлеров, ошибки,
+время SQL-запросов, состояние очереди баллов и кэша сущностей. Включаются
+METRICS_ENABLED=1; выключенные не регистрируют ни middleware, ни своего
+наблюдателя запросов (таймер запросов всё равно работает ради счётчика
+DbSessionMiddleware — см. database.db).
+
+    GET /metrics — отдельный сервер на METRICS_HOST:METRICS_PORT (по
+    умолчанию только localhost) в обоих режимах: публичный сервер вебхука
+    метрики не отдаёт.
+"""
+import re
+from bisect import bisect_left
+from typing import Callable, Iterator
+
+from aiohttp import web
+
+from config import METRICS_HOST, METRICS_PORT
+from database.db import add_query_observer
+from database.score_writer import score_writer
+from logger import app_logger
+from utils.entities import entity_cache_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+MAX_SERIES = 500  # на метрику; дальше всё попадает в other — защита от взрыва меток
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._series: dict[tuple[str, ...], float] = {}
+
+    def inc(self, values: tuple[str, ...], amount: float = 1.0) -> None:
+        if values not in self._series and len(self._series) >= MAX_SERIES:
+            values = ("other",) * len(self.labels)
+        self._series[values] = self._series.get(values, 0.0) + amount
+
+    def series_count(self) -> int:
+        return len(self._series)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for values, total in self._series.items():
+            yield f"{self.name}{_labels(self.labels, values)} {total:g}"
+
+
+class Histogram:
+    """Фиксированные бакеты; в памяти — счётчики по бакетам, сумма и количество."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # метки -> [по бакетам..., +Inf, сумма, количество]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, values: tuple[str, ...], seconds: float) -> None:
+        series = self._series.get(values)
+        if series is None:
+            if len(self._series) >= MAX_SERIES:
+                values = ("other",) * len(self.labels)
+            series = self._series.setdefault(values, [0] * (len(self.buckets) + 3))
+        series[bisect_left(self.buckets, seconds)] += 1
+        series[-2] += seconds
+        series[-1] += 1
+
+    def series_count(self) -> int:
+        return len(self._series)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        bounds = [f'le="{b:g}"' for b in self.buckets] + ['le="+Inf"']
+        for values, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                yield f"{self.name}_bucket{_labels(self.labels, values, bound)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, values)} {series[-2]:.6f}"
+            yield f"{self.name}_count{_labels(self.labels, values)} {series[-1]}"
+
+
+class Gauge:
+    """Значения снимаются в момент запроса /metrics: collect() -> {метки: число}."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], collect: Callable[[], dict]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.collect = collect
+
+    def series_count(self) -> int:
+        return len(self.collect())
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        for values, value in self.collect().items():
+            yield f"{self.name}{_labels(self.labels, values)} {value:g}"
+
+
+handler_latency = Histogram(
+    "bot_handler_duration_seconds",
+    "Время обработки апдейта хендлером",
+    ("handler", "prefix"),
+    LATENCY_BUCKETS,
+)
+handler_errors = Counter("bot_handler_errors_total", "Исключения в хендлерах", ("handler", "prefix"))
+sql_latency = Histogram(
+    "bot_sql_duration_seconds",
+    "Время выполнения SQL-запроса (cursor.execute)",
+    ("statement",),
+    SQL_BUCKETS,
+)
+
+score_writer_stats = Gauge(
+    "bot_score_writer",
+    "Очередь записи баллов: коммиты, изменения, глубина очереди (ScoreWriter.stats)",
+    ("stat",),
+    lambda: {(stat,): value for stat, value in score_writer.stats().items()},
+)
+
+entity_cache = Gauge(
+    "bot_entity_cache",
+    "Кэш команд и субботников (utils.entities): размер, попадания, промахи",
+    ("cache", "stat"),
+    lambda: {(cache, stat): value for cache, stats in entity_cache_stats().items() for stat, value in stats.items()},
+)
+
+REGISTRY = (handler_latency, handler_errors, sql_latency, score_writer_stats, entity_cache)
+
+
+# IN (?, ?, ?) с разным числом параметров, числа и строки в тексте запроса
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+_normalized: dict[str, str] = {}
+
+
+def normalize_sql(statement: str) -> str:
+    """Текст запроса без значений: одна серия метрики на один запрос в коде."""
+    normalized = _normalized.get(statement)
+    if normalized is None:
+        normalized = _SPACES.sub(" ", statement).strip()
+        normalized = _IN_LIST.sub("(?...)", normalized)
+        normalized = _LITERAL.sub("?", normalized)[:200]
+        if len(_normalized) < 10_000:
+            _normalized[statement] = normalized
+    return normalized
+
+
+def observe_query(statement: str, elapsed: float) -> None:
+    sql_latency.observe((normalize_sql(statement),), elapsed)
+
+
+def enable_sql_metrics() -> None:
+    add_query_observer(observe_query)
+
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+async def metrics_handler(request: web.Request) -> web.Response:
+    return web.Response(
+        body=render().encode(), headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+    )
+
+
+async def start_metrics_server(host: str = METRICS_HOST, port: int = METRICS_PORT) -> web.AppRunner:
+    """Отдельный локальный сервер /metrics."""
+    app = web.Application()
+    app.router.add_get("/metrics", metrics_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    app_logger.info(f"📈 Метрики: http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,41 @@
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update, User
+
+from logger import app_logger
+from utils.admins import is_admin
+
+DENIED_TEXT = "⛔ У тебя нет прав для использования бота."
+
+
+class AdminMiddleware(BaseMiddleware):
+    """
+    Пропускает к хендлерам только админов. Проверка идёт по множеству в памяти
+    (utils.admins), так что на обычный апдейт запросов к базе нет.
+    /start пропускаем всегда: он регистрирует пользователя в users.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user: User | None = data.get("event_from_user")
+
+        if user is not None and await is_admin(user.id):
+            return await handler(event, data)
+
+        if isinstance(event, Update) and event.message and (event.message.text or "").startswith("/start"):
+            return await handler(event, data)
+
+        if user is not None:
+            app_logger.info(f"⛔ Доступ запрещён обычному пользователю: {user.id} | @{user.username or '-'}")
+
+        if isinstance(event, Update):
+            if event.callback_query:
+                await event.callback_query.answer(DENIED_TEXT, show_alert=True)
+            elif event.message:
+                await event.message.answer(DENIED_TEXT)
+        return None
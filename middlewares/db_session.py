@@ -0,0 +1,138 @@
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from database.db import add_query_observer, async_read_session, async_session
+from logger import db_logger
+
+SLOW_UPDATE_QUERIES = 20  # больше запросов за один апдейт — предупреждение в лог
+
+# Unit of work текущего апдейта — сюда хуки движка пишут счётчики запросов
+_current: ContextVar["UnitOfWork | None"] = ContextVar("unit_of_work", default=None)
+
+
+class UnitOfWork:
+    """
+    Сессии одного апдейта. Открываются лениво, при первом обращении:
+    session — пул записи, read — пул только для чтения (списки, отчёты).
+    Апдейт без запросов к базе соединение из пула не берёт вовсе.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = async_session,
+        read_factory: async_sessionmaker = async_read_session,
+    ):
+        self._session_factory = session_factory
+        self._read_factory = read_factory
+        self._session: AsyncSession | None = None
+        self._read: AsyncSession | None = None
+        self.queries = 0
+        self.query_time = 0.0  # секунд внутри cursor.execute
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    @property
+    def read(self) -> AsyncSession:
+        if self._read is None:
+            self._read = self._read_factory()
+        return self._read
+
+    async def commit(self) -> None:
+        """
+        Коммит посреди апдейта — перед кэшами и ответами, которые должны видеть
+        записанное. Соединения возвращаются в пул, сессии остаются рабочими.
+        """
+        if self._session is not None:
+            await self._session.commit()
+        if self._read is not None:
+            await self._read.commit()
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+        if self._read is not None:
+            await self._read.rollback()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+        if self._read is not None:
+            await self._read.close()
+
+
+def _count_query(statement: str, elapsed: float) -> None:
+    """Наблюдатель database.db: запросы и время в базе текущего UnitOfWork."""
+    uow = _current.get()
+    if uow is not None:
+        uow.queries += 1
+        uow.query_time += elapsed
+
+
+class DbSessionMiddleware(BaseMiddleware):
+    """
+    Один UnitOfWork на апдейт: хендлеры получают его аргументом `uow`.
+    Успешный апдейт коммитится, при исключении — откат. Счётчики запросов
+    и времени в базе копятся в updates / queries / query_time.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = async_session,
+        read_factory: async_sessionmaker = async_read_session,
+    ):
+        self.session_factory = session_factory
+        self.read_factory = read_factory
+        self.updates = 0
+        self.queries = 0
+        self.query_time = 0.0
+        add_query_observer(_count_query)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        uow = UnitOfWork(self.session_factory, self.read_factory)
+        data["uow"] = uow
+        token = _current.set(uow)
+        try:
+            result = await handler(event, data)
+            await uow.commit()
+            return result
+        except BaseException:
+            await uow.rollback()
+            raise
+        finally:
+            await uow.close()
+            _current.reset(token)
+            self._record(event, uow)
+
+    def _record(self, event: TelegramObject, uow: UnitOfWork) -> None:
+        self.updates += 1
+        self.queries += uow.queries
+        self.query_time += uow.query_time
+        if not uow.queries:
+            return
+
+        update_id = event.update_id if isinstance(event, Update) else "-"
+        message = f"🗄️ Апдейт {update_id}: {uow.queries} запросов, {uow.query_time * 1000:.1f} мс в базе"
+        if uow.queries > SLOW_UPDATE_QUERIES:
+            db_logger.warning(message)
+        else:
+            db_logger.debug(message)
+
+    def stats(self) -> dict:
+        return {
+            "updates": self.updates,
+            "queries": self.queries,
+            "query_time_ms": round(self.query_time * 1000, 1),
+        }
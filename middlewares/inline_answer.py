@@ -0,0 +1,72 @@
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import AnswerCallbackQuery, TelegramMethod
+from aiogram.methods.base import Response, TelegramType
+from aiogram.types import TelegramObject, Update
+
+# Ответ на callback текущего апдейта, который ждёт отправки в теле HTTP-ответа
+_pending_answer: ContextVar[dict[str, Any] | None] = ContextVar("pending_answer", default=None)
+
+
+class InlineAnswerMiddleware(BaseMiddleware):
+    """
+    В режиме вебхука ответ на callback_query (снятие «часиков» с кнопки)
+    не уходит отдельным запросом к Bot API, а возвращается Telegram прямо в
+    ответе на вебхук — минус один round-trip на каждое нажатие.
+
+    Включается флагом `inline_answers` в данных апдейта (его передаёт
+    обработчик вебхука); при polling ничего не делает.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not data.get("inline_answers") or not isinstance(event, Update) or not event.callback_query:
+            return await handler(event, data)
+
+        slot: dict[str, Any] = {"id": event.callback_query.id, "answer": None}
+        token = _pending_answer.set(slot)
+        try:
+            result = await handler(event, data)
+        finally:
+            _pending_answer.reset(token)
+
+        answer = slot["answer"]
+        if answer is None:
+            return result
+        if isinstance(result, TelegramMethod):
+            # В ответ на вебхук помещается только один метод — ответ на callback шлём сами
+            await data["bot"](answer)
+            return result
+        return answer
+
+
+class InlineAnswerCapture(BaseRequestMiddleware):
+    """
+    Middleware сессии бота: перехватывает первый answerCallbackQuery для
+    апдейта, который обрабатывается InlineAnswerMiddleware, и откладывает его
+    до ответа на вебхук. Остальные запросы идут в Bot API как обычно.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        slot = _pending_answer.get()
+        if (
+            slot is not None
+            and slot["answer"] is None
+            and isinstance(method, AnswerCallbackQuery)
+            and method.callback_query_id == slot["id"]
+        ):
+            slot["answer"] = method
+            return True  # type: ignore
+        return await make_request(bot, method)
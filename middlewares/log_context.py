@@ -0,0 +1,33 @@
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update, User
+
+from logger import log_context
+
+
+class LogContextMiddleware(BaseMiddleware):
+    """
+    Поля апдейта для JSON-логов. Снаружи (dp.update.outer_middleware) —
+    update_id и user_id, внутри роутеров (dp.message.middleware и т.п.) —
+    имя хендлера. Callback'и уточняют имя в handlers.routing.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        fields = dict(log_context.get())
+        if isinstance(event, Update):
+            user: User | None = data.get("event_from_user")
+            fields = {"update_id": event.update_id, "user_id": user.id if user else None}
+        elif "handler" in data:
+            fields["handler"] = data["handler"].callback.__name__
+
+        token = log_context.set(fields)
+        try:
+            return await handler(event, data)
+        finally:
+            log_context.reset(token)
@@ -0,0 +1,59 @@
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.bases import CancelHandler, SkipHandler
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from logger import log_context
+from metrics import handler_errors, handler_latency
+
+
+def event_prefix(event: TelegramObject) -> str:
+    """Метка апдейта: префикс callback_data или команда; прочий текст — text."""
+    if isinstance(event, CallbackQuery):
+        return (event.data or "").partition(":")[0]
+    if isinstance(event, Message) and event.text and event.text.startswith("/"):
+        return event.text.split(maxsplit=1)[0].partition("@")[0]
+    return "text"
+
+
+def handler_name(data: dict[str, Any]) -> str:
+    """
+    Имя хендлера, который обработал апдейт. Все callback'и проходят через
+    один диспетчер handlers.routing — настоящий хендлер он кладёт в контекст
+    логов (bind_log_context), его и берём; для сообщений — хендлер aiogram.
+    """
+    name = log_context.get().get("handler")
+    if name:
+        return name
+    handler = data.get("handler")
+    return handler.callback.__name__ if handler else "-"
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """
+    Задержка и ошибки хендлеров по имени хендлера и префиксу. Вешается как
+    внутренний middleware (dp.message.middleware, dp.callback_query.middleware):
+    сюда доходят только апдейты, для которых нашёлся хендлер. Пропуск
+    (SkipHandler — префикс не наш) ошибкой не считается и не замеряется.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await handler(event, data)
+        except (SkipHandler, CancelHandler):
+            raise
+        except Exception:
+            labels = (handler_name(data), event_prefix(event))
+            handler_errors.inc(labels)
+            handler_latency.observe(labels, time.perf_counter() - started)
+            raise
+        handler_latency.observe((handler_name(data), event_prefix(event)), time.perf_counter() - started)
+        return result
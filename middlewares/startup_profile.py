@@ -0,0 +1,26 @@
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from startup_profile import startup_profile
+
+
+class FirstUpdateMiddleware(BaseMiddleware):
+    """
+    Отмечает в профиле старта первый обработанный апдейт и пишет отчёт.
+    Регистрируется только при STARTUP_PROFILE; дальше — одна проверка флага.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        try:
+            return await handler(event, data)
+        finally:
+            if not startup_profile.reported:
+                startup_profile.mark("первый апдейт")
+                startup_profile.report()
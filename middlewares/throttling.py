@@ -0,0 +1,90 @@
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, TelegramObject
+
+from utils.cache import LRUCache, TTLCache
+from utils.callback_data import ScoreBags, ScoreConfirm, ScoreTeamPage
+
+# Окно, в котором повторный callback с той же кнопки считается дублем
+DUPLICATE_WINDOW = 1.5  # секунд
+
+# Токен-бакеты по префиксу callback_data: (ёмкость, пополнение в секунду)
+DEFAULT_RATE = (10, 5.0)
+PREFIX_RATES = {
+    ScoreTeamPage.__prefix__: (3, 2.0),
+    "events_page": (3, 2.0),
+    "view_teams": (3, 2.0),
+    ScoreConfirm.__prefix__: (2, 1.0),
+    ScoreBags.__prefix__: (2, 1.0),
+    "export_event": (1, 0.2),
+}
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated_at")
+
+    def __init__(self, capacity: int, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def consume(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Гасит повторные нажатия одной и той же кнопки (двойной тап по
+    «✅ Подтвердить» больше не пишет два начисления) и ограничивает частоту
+    callback'ов пользователя по каждому префиксу, чтобы частое листание
+    страниц не превращалось в поток запросов к базе и Bot API.
+    """
+
+    def __init__(self, duplicate_window: float = DUPLICATE_WINDOW):
+        self._seen = TTLCache(ttl=duplicate_window)
+        self._buckets = LRUCache(maxsize=10_000)
+        self.duplicates = 0
+        self.throttled = 0
+
+    @property
+    def suppressed(self) -> int:
+        return self.duplicates + self.throttled
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, CallbackQuery) or not event.data:
+            return await handler(event, data)
+
+        user_id = event.from_user.id
+        message_id = event.message.message_id if event.message else None
+
+        if not self._seen.add((user_id, message_id, event.data)):
+            self.duplicates += 1
+            await event.answer()
+            return None
+
+        prefix = event.data.split(":", 1)[0]
+        bucket = self._buckets.get((user_id, prefix))
+        if bucket is None:
+            bucket = TokenBucket(*PREFIX_RATES.get(prefix, DEFAULT_RATE))
+            self._buckets.set((user_id, prefix), bucket)
+
+        if not bucket.consume():
+            self.throttled += 1
+            await event.answer("⏳ Не так быстро")
+            return None
+
+        return await handler(event, data)
@@ -0,0 +1,106 @@
+"""
+Профиль холодного старта: сколько стоит импорт каждого модуля и через
+сколько после запуска бот обработал первый апдейт.
+
+    STARTUP_PROFILE=1 python main.py
+
+main.py импортирует этот модуль первым, поэтому все остальные импорты
+проходят через таймер. Этапы старта отмечаются mark(), отчёт пишется в лог
+после первого апдейта (middlewares.startup_profile). Без STARTUP_PROFILE
+модуль ничего не ставит.
+"""
+import importlib.abc
+import sys
+import time
+
+from config import STARTUP_PROFILE
+
+TOP_MODULES = 15  # сколько самых дорогих импортов показать
+
+
+class _TimedLoader:
+    """Обёртка над загрузчиком: засекает exec_module, остальное — как есть."""
+
+    def __init__(self, loader, profile: "StartupProfile", name: str):
+        self._loader = loader
+        self._profile = profile
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profile._enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profile._leave(self._name)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    def __init__(self, profile: "StartupProfile"):
+        self._profile = profile
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profile, name)
+            return spec
+        return None
+
+
+class StartupProfile:
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.marks: list[tuple[str, float]] = []
+        # модуль -> (своё время, вместе с вложенными импортами), секунд
+        self.imports: dict[str, tuple[float, float]] = {}
+        self._stack: list[list[float]] = []  # [начало, время вложенных импортов]
+        self._timer = _ImportTimer(self)
+        self.reported = False
+        if enabled:
+            sys.meta_path.insert(0, self._timer)
+
+    def _enter(self) -> None:
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def _leave(self, name: str) -> None:
+        started, children = self._stack.pop()
+        total = time.perf_counter() - started
+        self.imports[name] = (total - children, total)
+        if self._stack:
+            self._stack[-1][1] += total
+
+    def mark(self, phase: str) -> None:
+        """Отметка этапа: время от старта main.py до этой точки."""
+        if not self.enabled:
+            return
+        if self._timer in sys.meta_path:  # импорты самого бота закончились
+            sys.meta_path.remove(self._timer)
+        self.marks.append((phase, time.perf_counter() - self.started))
+
+    def report(self) -> None:
+        from logger import app_logger  # не раньше: logger сам должен попасть в таблицу импортов
+
+        self.reported = True
+        lines = ["⏱️ Профиль старта:"]
+        lines += [f"  {phase:<24} {at * 1000:8.1f} мс" for phase, at in self.marks]
+        imports_total = sum(own for own, _ in self.imports.values())
+        lines.append(f"  импорт {len(self.imports)} модулей: {imports_total * 1000:.1f} мс, самые дорогие:")
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)[:TOP_MODULES]
+        lines += [
+            f"    {name:<40} {total * 1000:8.1f} мс (сам {own * 1000:.1f})" for name, (own, total) in slowest
+        ]
+        app_logger.info("\n".join(lines))
+
+
+startup_profile = StartupProfile(STARTUP_PROFILE)
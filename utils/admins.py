@@ -0,0 +1,47 @@
+import os
+import time
+
+from sqlalchemy import select
+
+from database.db import async_session
+from database.models import User
+from logger import app_logger
+
+ADMINS_TTL = 300  # секунд между перечитываниями users.is_admin
+
+_admin_ids: set[int] = set()
+_loaded_at: float | None = None
+
+
+def env_admin_ids() -> set[int]:
+    return {int(i.strip()) for i in os.getenv("ADMIN_IDS", "").split(",") if i.strip().isdigit()}
+
+
+async def load_admins() -> set[int]:
+    """Перечитывает множество админов: users.is_admin + ADMIN_IDS из окружения."""
+    global _admin_ids, _loaded_at
+
+    async with async_session() as session:
+        result = await session.execute(select(User.telegram_id).where(User.is_admin.is_(True)))
+        admin_ids = set(result.scalars().all()) | env_admin_ids()
+
+    _admin_ids, _loaded_at = admin_ids, time.monotonic()
+    app_logger.info(f"🔐 Загружен список админов: {len(admin_ids)}")
+    return admin_ids
+
+
+async def get_admins() -> set[int]:
+    """Множество админов из памяти; в базу ходим только раз в ADMINS_TTL."""
+    if _loaded_at is None or time.monotonic() - _loaded_at > ADMINS_TTL:
+        return await load_admins()
+    return _admin_ids
+
+
+async def is_admin(telegram_id: int) -> bool:
+    return telegram_id in await get_admins()
+
+
+def invalidate_admins() -> None:
+    """Сбрасывает кэш — следующий апдейт перечитает админов из базы."""
+    global _loaded_at
+    _loaded_at = None
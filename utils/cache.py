@@ -0,0 +1,90 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LRUCache:
+    """Небольшой in-process LRU-кэш с ограничением по размеру."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache:
+    """Множество ключей, каждый живёт ttl секунд; размер ограничен maxsize."""
+
+    def __init__(self, ttl: float, maxsize: int = 10_000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._expires: OrderedDict[Hashable, float] = OrderedDict()
+
+    def _evict(self, now: float) -> None:
+        while self._expires and next(iter(self._expires.values())) <= now:
+            self._expires.popitem(last=False)
+        while len(self._expires) > self.maxsize:
+            self._expires.popitem(last=False)
+
+    def add(self, key: Hashable) -> bool:
+        """Запоминает ключ; False, если он уже был в пределах ttl."""
+        now = time.monotonic()
+        self._evict(now)
+        if key in self._expires:
+            return False
+        self._expires[key] = now + self.ttl
+        return True
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+
+# Отрендеренные страницы "Все команды" + общее число команд (ключ "total").
+# Сбрасывается при создании команды или субботника.
+teams_view_cache = LRUCache(maxsize=32)
+
+# Версия данных субботника: растёт при любой записи баллов или команд.
+# Кэши, привязанные к (event_id, версия), после записи просто перестают совпадать.
+_event_versions: dict[int, int] = {}
+
+
+def event_version(event_id: int) -> int:
+    return _event_versions.get(event_id, 0)
+
+
+def bump_event_version(event_id: int) -> None:
+    _event_versions[event_id] = _event_versions.get(event_id, 0) + 1
+
+
+# Отчёт и Excel-выгрузка: ключ ("report" | "export", event_id, версия),
+# значение — текст отчёта или Telegram file_id уже загруженного xlsx.
+event_reports_cache = LRUCache(maxsize=64)
@@ -0,0 +1,104 @@
+from aiogram.filters.callback_data import CallbackData
+
+# Типизированные callback_data: <prefix>:<поле>:<поле>... (не длиннее 64 байт).
+# Кнопки собираются через .pack(), хендлеры получают уже разобранный объект.
+
+# Версия формата кнопок начисления — входит в их префиксы. При несовместимом
+# изменении полей увеличиваем её, а старые префиксы переносим в
+# utils.constants.LEGACY_CALLBACKS: такие кнопки в истории чата получат
+# ответ «кнопка устарела», а не разберутся неправильно.
+SCORE_CALLBACK_VERSION = 1
+_V = SCORE_CALLBACK_VERSION
+
+
+# 🗓️ Выбор субботника (handlers.event_picker)
+class TeamEvent(CallbackData, prefix="event"):
+    event_id: int
+
+
+class ScoreEvent(CallbackData, prefix="score_event"):
+    event_id: int
+
+
+class AdjustEvent(CallbackData, prefix="adjust_event"):
+    event_id: int
+
+
+class ReportEvent(CallbackData, prefix="report_event"):
+    event_id: int
+
+
+class ExportEvent(CallbackData, prefix="export_event"):
+    event_id: int
+
+
+class EventsPage(CallbackData, prefix="events_page"):
+    picker: str  # prefix кнопок пикера
+    page: int
+    direction: str  # next | prev
+    cursor: int
+
+
+# 📊 Начисление баллов. Всё, что нужно хендлеру, едет в самой кнопке —
+# FSM по ходу начисления не читается и не пишется.
+class ScoreTeamPage(CallbackData, prefix=f"stp{_V}"):
+    event_id: int
+    page: int
+    direction: str  # n | p
+    cursor: int
+
+
+class ScoreTeam(CallbackData, prefix=f"st{_V}"):
+    team_id: int
+
+
+class ScoreCategory(CallbackData, prefix=f"sc{_V}"):
+    team_id: int
+    key: str
+
+
+class ScorePoints(CallbackData, prefix=f"sp{_V}"):
+    team_id: int
+    key: str
+    points: int
+
+
+class ScoreConfirm(CallbackData, prefix=f"sok{_V}"):
+    team_id: int
+    key: str
+    points: int
+
+
+# Клавиатура количества для категорий «fixed»: набранное число едет в кнопке
+class ScoreQty(CallbackData, prefix=f"sq{_V}"):
+    team_id: int
+    key: str
+    count: int
+
+
+class ScoreBags(CallbackData, prefix=f"sbg{_V}"):
+    """Начислить count мешков одной записью."""
+
+    team_id: int
+    key: str
+    count: int
+
+
+class ScoreBack(CallbackData, prefix=f"sbk{_V}"):
+    """Отклонить / назад — снова выбор категории для команды."""
+
+    team_id: int
+
+
+# ⚙️ Управление баллами
+class AdjustTeam(CallbackData, prefix="adjust_team"):
+    team_id: int
+
+
+class AdjustDelete(CallbackData, prefix="adjust_delete"):
+    category: str
+
+
+# 📂 Просмотр базы
+class ViewTeamsPage(CallbackData, prefix="view_teams"):
+    page: int
@@ -34,10 +34,31 @@ CALLBACKS = {
     "Назад к базе данных": "view_database",
     "Назад к выбору субботника (оценка)": "score_start",
     "Назад к выбору субботника (отчёт)": "view_report",
-    # Динамические (с доп. id)
+    # Динамические (с доп. id), классы — в utils/callback_data.py
     "Выбор субботника для отчёта": "report_event:<event_id>",  # пример: report_event:2
     "Выбор субботника для команды": "event:<event_id>",
     "Выбор субботника для баллов": "score_event:<event_id>",
-    "Выбор команды для баллов": "score_team:<team_id>",
-    "Выбор категории для баллов": "score_cat:<category_key>",
+    "Страница выбора субботника": "events_page:<prefix>:<page>:<next|prev>:<event_id>",
+    # Начисление баллов, версия 1 (цифра в префиксе — SCORE_CALLBACK_VERSION)
+    "Страница команд для баллов": "stp1:<event_id>:<page>:<n|p>:<team_id>",
+    "Выбор команды для баллов": "st1:<team_id>",
+    "Выбор категории для баллов": "sc1:<team_id>:<category_key>",
+    "Выбор количества баллов": "sp1:<team_id>:<category_key>:<points>",
+    "Подтверждение начисления": "sok1:<team_id>:<category_key>:<points>",
+    "Набор количества мешков": "sq1:<team_id>:<category_key>:<count>",
+    "Начисление мешков": "sbg1:<team_id>:<category_key>:<count>",
+    "Отклонить / назад к категориям": "sbk1:<team_id>",
 }
+
+# Префиксы кнопок, которые больше не выпускаются, но могут остаться в истории
+# чата. На нажатие отвечаем «кнопка устарела» (handlers.routing).
+LEGACY_CALLBACKS = (
+    # до версии 1: данные начисления лежали в FSM
+    "score_team_page",
+    "score_team",
+    "score_cat",
+    "score_points",
+    "score_confirm",
+    "score_reject",
+    "score_cancel",
+)
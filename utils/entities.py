@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db import async_read_session
+from database.models import Event, Team
+from logger import app_logger
+from utils.cache import LRUCache
+
+ENTITY_CACHE_SIZE = 2048  # записей на каждый тип
+
+
+@dataclass(frozen=True)
+class TeamInfo:
+    id: int
+    name: str
+    event_id: int
+
+
+@dataclass(frozen=True)
+class EventInfo:
+    id: int
+    title: str
+
+
+# id → метаданные; промахи не кэшируем, чтобы новая запись сразу находилась
+_teams = LRUCache(maxsize=ENTITY_CACHE_SIZE)
+_events = LRUCache(maxsize=ENTITY_CACHE_SIZE)
+
+
+async def _fetch_row(stmt, session: AsyncSession | None):
+    # В хендлере передаём сессию апдейта (uow.read), иначе открываем свою
+    if session is not None:
+        return (await session.execute(stmt)).first()
+    async with async_read_session() as own_session:
+        return (await own_session.execute(stmt)).first()
+
+
+async def get_team(team_id: int, session: AsyncSession | None = None) -> TeamInfo | None:
+    """Название и субботник команды: из памяти, при промахе — один запрос по PK."""
+    info = _teams.get(team_id)
+    if info is None:
+        row = await _fetch_row(select(Team.id, Team.name, Team.event_id).where(Team.id == team_id), session)
+        if row is None:
+            return None
+        info = TeamInfo(*row)
+        _teams.set(team_id, info)
+    return info
+
+
+async def get_event(event_id: int, session: AsyncSession | None = None) -> EventInfo | None:
+    """Название субботника: из памяти, при промахе — один запрос по PK."""
+    info = _events.get(event_id)
+    if info is None:
+        row = await _fetch_row(select(Event.id, Event.title).where(Event.id == event_id), session)
+        if row is None:
+            return None
+        info = EventInfo(*row)
+        _events.set(event_id, info)
+    return info
+
+
+async def warm_entity_cache(session: AsyncSession, events: int) -> None:
+    """Последние `events` субботников и их команды — в кэш ещё до первого апдейта."""
+    stmt = select(Event.id, Event.title).order_by(Event.created_at.desc(), Event.id.desc()).limit(events)
+    event_ids = []
+    for row in (await session.execute(stmt)).all():
+        _events.set(row.id, EventInfo(*row))
+        event_ids.append(row.id)
+
+    stmt = (
+        select(Team.id, Team.name, Team.event_id)
+        .where(Team.event_id.in_(event_ids))
+        .limit(ENTITY_CACHE_SIZE)
+    )
+    for row in (await session.execute(stmt)).all():
+        _teams.set(row.id, TeamInfo(*row))
+
+
+# Вызываются после коммита создания/переименования. При создании тоже:
+# SQLite может выдать id удалённой строки повторно.
+def invalidate_team(team_id: int) -> None:
+    _teams.pop(team_id)
+
+
+def invalidate_event(event_id: int) -> None:
+    _events.pop(event_id)
+
+
+def entity_cache_stats() -> dict:
+    return {
+        "teams": {"size": len(_teams), "hits": _teams.hits, "misses": _teams.misses},
+        "events": {"size": len(_events), "hits": _events.hits, "misses": _events.misses},
+    }
+
+
+async def log_entity_cache_stats() -> None:
+    """На остановке бота — рядом со статистикой очереди баллов."""
+    app_logger.info(f"🗂️ Кэш сущностей: {entity_cache_stats()}")
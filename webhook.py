@@ -0,0 +1,88 @@
+import asyncio
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+from sqlalchemy import text
+
+from config import WEBHOOK_BASE_URL, WEBHOOK_HOST, WEBHOOK_PATH, WEBHOOK_PORT, WEBHOOK_SECRET
+from database.db import engine
+from logger import app_logger
+from middlewares.inline_answer import InlineAnswerCapture
+
+READY = web.AppKey("ready", bool)
+
+
+async def healthz(request: web.Request) -> web.Response:
+    """Живость: процесс запущен и отвечает."""
+    return web.json_response({"status": "ok"})
+
+
+async def readyz(request: web.Request) -> web.Response:
+    """Готовность: диспетчер стартовал и база отвечает — можно слать апдейты."""
+    if not request.app[READY]:
+        return web.json_response({"status": "starting"}, status=503)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        app_logger.warning(f"⚠️ readyz: база недоступна: {e}")
+        return web.json_response({"status": "db_unavailable"}, status=503)
+    return web.json_response({"status": "ready"})
+
+
+def build_app(dp: Dispatcher, bot: Bot, path: str = WEBHOOK_PATH, secret: str | None = WEBHOOK_SECRET) -> web.Application:
+    """
+    aiohttp-приложение с вебхуком и проверками /healthz, /readyz.
+    Апдейт обрабатывается до ответа Telegram (handle_in_background=False),
+    поэтому ответ на callback можно вернуть прямо в теле ответа.
+    """
+    app = web.Application()
+    app[READY] = False
+
+    # build_app может вызываться повторно для того же бота (тесты, бенчмарки) —
+    # перехватчик сессии регистрируем один раз, иначе цепочка middleware растёт
+    if not any(isinstance(m, InlineAnswerCapture) for m in bot.session.middleware):
+        bot.session.middleware(InlineAnswerCapture())
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=secret,
+        handle_in_background=False,
+        inline_answers=True,
+    ).register(app, path=path)
+    setup_application(app, dp, bot=bot)
+
+    async def mark_ready(_: web.Application) -> None:
+        app[READY] = True
+
+    async def mark_not_ready(_: web.Application) -> None:
+        app[READY] = False
+
+    app.on_startup.append(mark_ready)
+    app.on_shutdown.insert(0, mark_not_ready)
+    app.router.add_get("/healthz", healthz)
+    app.router.add_get("/readyz", readyz)
+    return app
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot) -> None:
+    """Поднимает сервер и регистрирует вебхук в Telegram (если задан WEBHOOK_BASE_URL)."""
+    runner = web.AppRunner(build_app(dp, bot))
+    await runner.setup()
+    await web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT).start()
+    app_logger.info(f"🌐 Вебхук слушает {WEBHOOK_HOST}:{WEBHOOK_PORT}{WEBHOOK_PATH}")
+
+    try:
+        if WEBHOOK_BASE_URL:
+            await bot.set_webhook(
+                WEBHOOK_BASE_URL.rstrip("/") + WEBHOOK_PATH,
+                secret_token=WEBHOOK_SECRET,
+                allowed_updates=dp.resolve_used_update_types(),
+            )
+        else:
+            app_logger.warning("⚠️ WEBHOOK_BASE_URL не задан — вебхук в Telegram не регистрируем")
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await bot.session.close()